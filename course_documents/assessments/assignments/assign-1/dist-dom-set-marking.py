@@ -1,71 +1,47 @@
-import networkx as nx
-import re
+import os
 import sys
 
-def get_just_number_list(str):
-    return [int(x) for x in re.findall(r"-?\d+", str)]
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from marking.client import forward_to_daemon
 
-def get_just_number(str):
-    m = re.search(r"-?\d+", str)
-    return int(m.group(0)) if m else None
-
-def read_dzn(filename):
-    from_list = []
-    to = []
-    n = 0
-    for line in open(filename):
-         if line.startswith('from'):
-            from_list = get_just_number_list(line)
-            
-         elif line.startswith('to'):
-            to = get_just_number_list(line)         
-
-         elif line.startswith('n'):
-            n = get_just_number(line)
-            
-    graph = nx.Graph()
-    for i in range(1, n):
-       graph.add_node(i)
-    for i in range(len(to)):
-       graph.add_edge(from_list[i], to[i])
-    return graph
+# with MARKING_DAEMON=1 set and a marking daemon running (python -m
+# marking.daemon) the run happens in its warm process instead; the output is
+# the same either way
+if __name__ == "__main__":
+    forward_to_daemon(__file__)
 
+from marking.csr import CSRGraph
+from marking.domination import distance_dominates
+from marking.dzn import read_dzn
+from marking.dzn_batch import main as batch_main
+from marking.mzn_output import last_solution
 
+# the last solution printed is the one marked, so runs that print
+# intermediate solutions are judged on their best one
 def read_solution(filename):
-    for line in open(filename):
-         if line.startswith('decision'):
-             return get_just_number_list(line.strip())  
-
-VERY_LARGE_NUMBER = 10000000000
-
-def find_shortest_path(graph, source, target_set):
-  min = VERY_LARGE_NUMBER
-  for target in target_set:
-    path = nx.shortest_path(graph, source, target)
-    if len(path) < min:
-      min = len(path)
-  return min -1
-
-def is_distance_dominated(graph, node, dom_set, k):
-  return find_shortest_path(graph, node, dom_set) <= k
-
-
-def distance_dominates(graph, dom_set, k):
-  for node in graph:
-    if not is_distance_dominated(graph, node, dom_set, k):
-      return False
-  return True
+    solution = last_solution(filename)
+    if solution is not None:
+        return solution.get('decision')
 
+# python dist-dom-set-marking.py --batch INSTANCES_DIR SUBMISSIONS_DIR [--csv FILE] [--workers N] [--distance K]
+# marks every submission's output for every instance, one CSV row per pair
 def main():
-    
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        batch_main(sys.argv)
+        return
+
     marking_string = ""
     dzn_file = sys.argv[1]
     output_file = sys.argv[2]    
     distance = int(sys.argv[3])    
 
-    graph = read_dzn(dzn_file)
+    graph = CSRGraph.from_dzn(read_dzn(dzn_file))
 
     binary_solution = read_solution(output_file)
+    if binary_solution is None:
+       # no solution in the output at all
+       print('false,0')
+       return
     node_solution = []
     for i in range(len(binary_solution)):
       if binary_solution[i] == 1:
@@ -1,15 +1,31 @@
+import os
+import sys
 import time
+from functools import partial
 import networkx as nx
-import submitted_dist_dom_solution
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from marking.domination import oracle_for
+from marking.driver import Job, call_submission, run_jobs
+from marking.stats import format_summary, instance_stats
+from marking.store import ResultStore, ortools_version, store_key
 
 
 RUNTIME_PRINTING = True
 
+SUBMISSION = os.path.join(os.path.dirname(os.path.abspath(__file__)), "submitted_dist_dom_solution.py")
+JOB_TIMEOUT = 60
+# address space (bytes) and CPU seconds each job may use; SCIP runs on one
+# thread, so the CPU limit matches the wall-clock one
+JOB_MEMORY_LIMIT = 4 << 30
+JOB_CPU_LIMIT = JOB_TIMEOUT
+
 # networkx graph
 def generate_binary_tree_instance(height):
   arity = 2
   tree = nx.balanced_tree(arity, height)
-  assert tree.degree(root) == arity
+  # networkx numbers the root 0
+  assert tree.degree(0) == arity
   return tree
 
 #  networkx graph
@@ -19,69 +35,85 @@ def generate_ladder_instance():
   return ladder
 
 
-VERY_LARGE_NUMBER = 10000000000
-
-def find_shortest_path(graph, source, target_set):
-  min = VERY_LARGE_NUMBER
-  for target in target_set:
-    path = nx.shortest_path(graph, source, target)
-    if len(path) < min:
-      min = len(path)
-  return min -1
-
-def is_distance_dominated(graph, node, dom_set, k):
-  return find_shortest_path(graph, node, dom_set) <= k
-
-
-def distance_dominates(graph, dom_set, k):
-  for node in graph:
-    if not is_distance_dominated(graph, node, dom_set, k):
-      return False
-  return True
-
-
-def skeleton_runs():
-    # runs_results dictionary will be have tuples as values, ("name-of-instance", distance_used)
+def skeleton_instances():
+    # a list of ("name-of-instance", graph, distances) triples,
     # where "name-of-instance" is a name I'll use for the graph involved, and 
-    # distance_used is a positive integer that is the distance used for distance domination     
-    runs_results = {}
+    # distances are the positive integers I'll use for distance domination on it
+    instances = []
     
     # I'll have a variety of instances, here are a few toy ones
     # as examples
     
     if RUNTIME_PRINTING:
         print("Doing path graphs")
-    graph = nx.path_graph(6)
-    name = "path_6_verts"
-    
-    for dist in [1, 2, 5]:
-        result_dict = submitted_dist_dom_solution.run_ilp(graph, distance = dist)
-        dom_cand = result_dict["dom_set"]
-        runs_results[(name, dist)] = (distance_dominates(graph, dom_cand, dist), len(dom_cand))
-    
+    instances.append(("path_6_verts", nx.path_graph(6), [1, 2, 5]))
 
     if RUNTIME_PRINTING:
         print("Doing complete graphs")
     # in a complete graph one vertex should suffice
-    graph = nx.complete_graph(6)
-    name = "complete_graph"
-    for dist in [1, 5]:
-        result_dict = submitted_dist_dom_solution.run_ilp(graph, distance = dist)
-        dom_cand = result_dict["dom_set"]
-        runs_results[(name, dist)] = (distance_dominates(graph, dom_cand, dist), len(dom_cand))
-
+    instances.append(("complete_graph", nx.complete_graph(6), [1, 5]))
 
     if RUNTIME_PRINTING:
         print("Doing grid graphs")
-    graph = nx.grid_2d_graph(5, 5)
-    name = "grid"
-    for dist in [1, 3, 5, 20]:
-        result_dict = submitted_dist_dom_solution.run_ilp(graph, distance = dist)
-        dom_cand = result_dict["dom_set"]
-        runs_results[(name, dist)] = (distance_dominates(graph, dom_cand, dist), len(dom_cand))
+    instances.append(("grid", nx.grid_2d_graph(5, 5), [1, 3, 5, 20]))
+
+    return instances
+
+
+# runs in the worker, after run_ilp; a reference run_ilp on a connected graph
+# leaves its CSR form and balls in this oracle, so only the check's one
+# breadth-first search is new
+def check_dom_set(graph, dist, result_dict):
+    dom_cand = result_dict["dom_set"]
+    return (oracle_for(graph).dominates(dom_cand, dist), len(dom_cand))
+
+
+# every (submission, instance, distance) is its own job, run in parallel
+# worker processes; a job still going after JOB_TIMEOUT seconds, or over its
+# memory or CPU limit, is stopped and marked as not dominating.  Peak memory,
+# CPU and wall time for every job go to results_path if it is given.  With a
+# store_path, settled outcomes are kept in that SQLite file and a later call
+# only runs the jobs that were not settled or whose submission file, graph,
+# distance, limits, solver version or marking code (this file included)
+# changed.  If stats is a dict it is filled with {"name-of-instance":
+# summary} of the run_ilp stats over every submission and distance (see
+# marking.stats).
+# Returns {submission: {("name-of-instance", distance_used): (dominates, size)}}
+def mark_submissions(submissions, workers = None, results_path = None, stats = None, store_path = None):
+    store = ResultStore(store_path) if store_path is not None else None
+    jobs = []
+    for (name, graph, dists) in skeleton_instances():
+        for submission in submissions:
+            for dist in dists:
+                run = partial(call_submission, submission, "run_ilp", graph, distance = dist)
+                key = None
+                if store is not None:
+                    params = {"distance": dist, "timeout": JOB_TIMEOUT, "memory_limit": JOB_MEMORY_LIMIT,
+                              "cpu_limit": JOB_CPU_LIMIT}
+                    key = store_key(submission, graph, params, ortools_version(), [__file__])
+                jobs.append(Job((submission, name, dist), run, partial(check_dom_set, graph, dist), key))
+
+    marks = {submission: {} for submission in submissions}
+    results = run_jobs(jobs, workers = workers, timeout = JOB_TIMEOUT, results_path = results_path,
+                       memory_limit = JOB_MEMORY_LIMIT, cpu_limit = JOB_CPU_LIMIT, store = store)
+    if store is not None:
+        store.close()
+    for result in results:
+        (submission, name, dist) = result.key
+        marks[submission][(name, dist)] = (result.valid, result.size)
+    if stats is not None:
+        stats.update(instance_stats(results, lambda key: key[1]))
+    return marks
 
 
-    return runs_results
+def skeleton_runs():
+    # runs_results dictionary will be have tuples as values, ("name-of-instance", distance_used)
+    stats = {}
+    marks = mark_submissions([SUBMISSION], stats = stats)[SUBMISSION]
+    if RUNTIME_PRINTING:
+        for name in stats:
+            print(format_summary(name, stats[name]))
+    return marks
    
 
 def nice_print(dict_of_results):
@@ -1,5 +1,7 @@
-import networkx as nx
-from ortools.linear_solver import pywraplp
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from marking.dom_ilp import solve_dominating_set, solve_dominating_sets
 
 # THIS FILE IS WHERE STUDENTS SHOULD DO THEIR WORK
 
@@ -15,50 +17,20 @@ from ortools.linear_solver import pywraplp
 # or None if the model does not halt in the time allowed
 # (The dictionary structure is so you can return other things if it's 
 # useful for your debugging)
-def run_ilp(instance_graph, distance = 1, timeout=1000):
+def run_ilp(instance_graph, distance = 1, timeout=1000, backend = "SCIP"):
   #  in here you can modify the graph to get whatever format you need, implement your ILP, call your solver
-  #  and then translate the result back into a set of nodes from instance_graph   
-  
-  #  This is obviously not a solution, but just me choosing a single vertex from the graph
-  
-  # Ensure undirected simple graph
-  G = nx.Graph(instance_graph)
-  nodes = list(G.nodes())
-  n = len(nodes)
+  #  and then translate the result back into a set of nodes from instance_graph
 
-  # Map between node labels and indices
-  idx_of = {node: i for i, node in enumerate(nodes)}
+  # each covering row comes from a breadth-first search cut off at depth
+  # distance, and vertices with the same ball share one row, so the model
+  # never needs all-pairs distances; safe reductions then shrink it before
+  # the solver sees it (see marking.dom_ilp and marking.dom_kernel); backend
+  # names any of the solvers in marking.dom_backends
+  return solve_dominating_set(instance_graph, distance, timeout, backend = backend)
 
-  # Handle trivial case k < 0
-  if distance < 0:
-    raise ValueError("Distance must be non-negative")
-    
-  solver = pywraplp.Solver.CreateSolver('SCIP')
-  if not solver:
-      return None
-  if timeout is not None and timeout > 0:
-    solver.SetTimeLimit(int(timeout))
-    
-  x = [solver.IntVar(0, 1, f'x_{i}') for i in range(n)]  # 1 if v is in dominating set, 0 otherwise
 
-  neighbourhoods = [] 
-  # Constraints: every vertex must be dominated
-  for v in nodes:
-    reachable = nx.single_source_shortest_path_length(G, v, cutoff=distance)
-    neighbourhoods.append(set(reachable.keys()))
-
-  # For each vertex v: must be dominated by at least one chosen node
-  for i, neigh in enumerate(neighbourhoods):
-    solver.Add(solver.Sum([x[idx_of[u]] for u in neigh]) >= 1)
-  
-  # Objective: minimize size of dominating set
-  solver.Minimize(solver.Sum(x))
-    
-  # Solve
-  status = solver.Solve()
-    
-  if status == pywraplp.Solver.OPTIMAL or status == pywraplp.Solver.FEASIBLE:
-    chosen_nodes = [nodes[i] for i in range(n) if x[i].solution_value() > 0.5]
-    return {'dom_set': chosen_nodes}
-  else:
-      return None
+# run_ilp for every distance in distances at once: {distance: run_ilp's
+# result}.  Each solve is seeded with the cover found for the previous,
+# smaller distance, which is still a cover (see marking.dom_ilp)
+def run_ilp_distances(instance_graph, distances, timeout=1000, backend = "SCIP"):
+  return solve_dominating_sets(instance_graph, distances, timeout, backend = backend)
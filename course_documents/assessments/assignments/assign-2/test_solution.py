@@ -1,6 +1,10 @@
+import os
+import sys
 import networkx as nx
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from marking.domination import distance_dominates
 from submitted_dist_dom_solution import run_ilp
-from lecturer_code_sample_dist_dom import distance_dominates
 
 def test_path_graphs():
     """Test path graphs with different distances"""
@@ -1,16 +1,38 @@
+import os
+import sys
 import time
+from functools import partial
 import networkx as nx
-import submitted_graph_burning_solution as sub
-from minizinc import Instance, Model, Solver
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from marking.burning import is_a_burning_seq
+from marking.driver import Job, call_submission, run_jobs
+from marking.mzn_async import MznRun, solve_all
+from marking.mzn_cache import edge_list_data
+from marking.stats import format_summary, instance_stats
+from marking.store import ResultStore, ortools_version, store_key
 
 
 RUNTIME_PRINTING = True
 
+# the directory holding the submitted .mzn and .py files
+SUBMISSION = os.path.dirname(os.path.abspath(__file__))
+JOB_TIMEOUT = 300
+# address space (bytes) each ILP trial may use; CP-SAT searches on several
+# threads, so CPU time is not limited, only wall-clock time
+JOB_MEMORY_LIMIT = 4 << 30
+MZN_CONCURRENCY = 8
+MZN_TIME_LIMIT = 300
+# set to a directory to keep each run's FlatZinc there, so a re-mark does not
+# flatten the same model and instance again
+MZN_FLAT_DIR = None
+
 # networkx graph
 def generate_binary_tree_instance(height):
   arity = 2
   tree = nx.balanced_tree(arity, height)
-  assert tree.degree(root) == arity
+  # networkx numbers the root 0
+  assert tree.degree(0) == arity
   return tree
 
 #  networkx graph
@@ -21,12 +43,16 @@ def generate_ladder_instance(height):
 
 # in case student doesn't do time zero, or the structure is longer than needed:
 def trim_trailing_nones(lst):
-    while lst and lst[-1] is None:
-        lst.pop()
+    end = len(lst)
+    while end and lst[end - 1] is None:
+        end -= 1
+    del lst[end:]
     return lst
 def trim_leading_nones(lst):
-    while lst and lst[0] is None:
-        lst.pop(0)
+    start = 0
+    while start < len(lst) and lst[start] is None:
+        start += 1
+    del lst[:start]
     return lst
 
 def translate_dec_1(dec_1):
@@ -52,10 +78,14 @@ def translate_dec_2(dec_2):
     max_t = len(dec_2[0])     # number of time steps
     burning_seq = [None] * max_t
 
-    for t in range(max_t):
-        for vertex in range(n):
-            if dec_2[vertex][t] == 1:
-                burning_seq[t] = vertex
+    # only the few rows with a 1 in them are walked in Python; a later vertex
+    # still wins if two are burned at the same time
+    for vertex in range(n):
+        row = dec_2[vertex]
+        if 1 in row:
+            for t in range(max_t):
+                if row[t] == 1:
+                    burning_seq[t] = vertex
     trim_trailing_nones(burning_seq)
     trim_leading_nones(burning_seq)
 
@@ -70,102 +100,134 @@ def parse_minizinc_result(result):
     finally:
         return decision
 
-BURN = "burn"
-OPEN = "open"
-
-def do_a_spread(graph, state_dict):
-    new_burns = []
-    for vertex in graph.nodes():
-        for other in graph.neighbors(vertex):
-            if state_dict[other] == BURN:
-                new_burns.append(vertex)
-    for vertex in new_burns:
-        state_dict[vertex] = BURN
-    
-    
-def is_a_burning_seq(graph, burning_seq):
-    state_dict = {}
-    for vertex in graph.nodes():
-        state_dict[vertex] = OPEN
-    
-    for time in range(len(burning_seq)):
-        do_a_spread(graph, state_dict)
-        state_dict[burning_seq[time]] = BURN
-    # and do one more step: allow spread without last selection
-    do_a_spread(graph, state_dict)        
-    
-    for vertex in graph.nodes():
-        if state_dict[vertex] != BURN:
-            return False
-    return True
-        
+# the model's vertex i+1 is nodes_list[i]; built once per distinct graph
+def minizinc_data(graph):
+    return edge_list_data(graph)
 
-    
-def do_minizinc_run(graph, result_dict, name_graph = "", name_of_minizinc ="graph-burning-assign-3.mzn"):
-    burning_csp = Model("./"+ name_of_minizinc)
-    gecode = Solver.lookup("gecode")
-    instance = Instance(gecode, burning_csp)
-    
-    n = len(graph.nodes())
-    m = len(graph.edges())
-    
-    name_dict = {}
-    
-    nodes_list =list(graph.nodes())
-    for index in range(len(nodes_list)):
-        name_dict[nodes_list[index]] = index +1
-    to_list = []
-    from_list = []
-    for (u, v) in graph.edges():
-        to_list.append(name_dict[u])
-        from_list.append(name_dict[v])
-    instance["n"] = n;
-    instance["m"] = m;
-    instance["from"] = from_list
-    instance["to"] = to_list
-    
-    result = instance.solve()
-    
+def minizinc_burn_seq(result, nodes_list):
     burning_seq = parse_minizinc_result(result)
-    graph = nx.Graph()
-    for edge in range(len(from_list)):
-        graph.add_edge(from_list[edge]-1, to_list[edge]-1)
-    
-    result_dict[(name_graph, "mzn")] = (is_a_burning_seq(graph, burning_seq), len(burning_seq))
-
-def do_ilp_run(graph, result_dict, name_graph = ""):
-    burning_seq = sub.run_ilp(graph)["burn_seq"]
-    result_dict[(name_graph, "ilp")] = (is_a_burning_seq(graph, burning_seq), len(burning_seq))
-    
-    
-def run_dual_trials(graph, result_dict, name_graph = "", 
-                    name_of_minizinc = "graph-burning-assign-3.mzn"):
-    print("running " + name_graph)
-    do_minizinc_run(graph, result_dict, name_graph = name_graph, name_of_minizinc = name_of_minizinc)    
-    do_ilp_run(graph, result_dict, name_graph = name_graph)
-
-def skeleton_runs():
-    name_of_minizinc = "graph-burning-assign-3.mzn"
-    result_dict = {}
+    if burning_seq is None:
+        return None
+    # (an index past the end names no vertex, and lights nothing)
+    return [nodes_list[v] if v is not None and v < len(nodes_list) else None for v in burning_seq]
+
+# runs in the worker, after run_ilp has finished
+def check_burn_seq(graph, result_dict):
+    burning_seq = result_dict["burn_seq"]
+    return (is_a_burning_seq(graph, burning_seq), len(burning_seq))
+    
+    
+# each submission is a directory holding the two files students upload; with
+# a store the job is filed under the .py file's content, the graph and the
+# marking code, this file's check_burn_seq included
+def ilp_job(graph, submission, name_graph = "", store = None):
+    path_to_ilp = os.path.join(submission, "submitted_graph_burning_solution.py")
+    key = None
+    if store is not None:
+        params = {"timeout": JOB_TIMEOUT, "memory_limit": JOB_MEMORY_LIMIT}
+        key = store_key(path_to_ilp, graph, params, ortools_version(), [__file__])
+    return Job((submission, name_graph, "ilp"), partial(call_submission, path_to_ilp, "run_ilp", graph),
+               partial(check_burn_seq, graph), key)
+
+def skeleton_instances():
+    instances = []
     
 #     note that you may not be able to solve instances up to the full sizes - this is meant to be challenging, some students may not manage it
 
     for size in [4,6,10]:
     # for size in [3, 5]:
-        path_graph = nx.path_graph(size)
-        run_dual_trials(path_graph, result_dict, name_graph = "path_"+str(size))
+        instances.append(("path_"+str(size), nx.path_graph(size)))
         
     for height in [4, 6, 10]:
     # for height in [4]:
-        ladder_graph = generate_ladder_instance(height)
-        run_dual_trials(ladder_graph, result_dict, name_graph = "ladder_"+str(height))
+        instances.append(("ladder_"+str(height), generate_ladder_instance(height)))
     
     for dim in [3, 5, 7]:
     # for dim in [3]:
-        grid_graph = nx.grid_2d_graph(dim, dim)
-        run_dual_trials(grid_graph, result_dict, name_graph = "grid_"+str(dim))
-    
+        instances.append(("grid_"+str(dim), nx.grid_2d_graph(dim, dim)))
+    return instances
+
+# every ILP trial is its own job, run in parallel worker processes; a trial
+# still going after JOB_TIMEOUT seconds, or over JOB_MEMORY_LIMIT, is stopped
+# and marked as not burning the graph.  The MiniZinc models then run
+# MZN_CONCURRENCY at a time, each stopped after MZN_TIME_LIMIT seconds and
+# marked on the best sequence it had found by then.  flat_dir is passed on to
+# solve_all.  With a store_path the settled ILP outcomes are kept in that
+# SQLite file, and a later call only reruns the trials that were not settled
+# or whose .py file, graph, limits, solver version or marking code changed.
+# If stats is a dict it is filled with {name_graph: summary} of the ILP
+# trials' run_ilp stats (see marking.stats).  Every MiniZinc run that
+# errored, was cut off or found nothing is reported (see mzn_note), and if
+# mzn_notes is a dict it gets {(submission, name_graph): note} for them.
+# Returns {submission: {(name_graph, "mzn" or "ilp"): (is_burning_seq, length)}}
+def mark_submissions(submissions, workers = None, results_path = None,
+                     name_of_minizinc = "graph-burning-assign-3.mzn", flat_dir = MZN_FLAT_DIR, stats = None,
+                     store_path = None, mzn_notes = None):
+    store = ResultStore(store_path) if store_path is not None else None
+    jobs = []
+    runs = []
+    graphs = {}
+    for (name_graph, graph) in skeleton_instances():
+        print("running " + name_graph)
+        data, nodes_list = minizinc_data(graph)
+        graphs[name_graph] = (graph, nodes_list)
+        for submission in submissions:
+            jobs.append(ilp_job(graph, submission, name_graph = name_graph, store = store))
+            runs.append(MznRun((submission, name_graph), os.path.join(submission, name_of_minizinc), data))
+
+    marks = {submission: {} for submission in submissions}
+    results = run_jobs(jobs, workers = workers, timeout = JOB_TIMEOUT, results_path = results_path,
+                       memory_limit = JOB_MEMORY_LIMIT, store = store)
+    if store is not None:
+        store.close()
+    for result in results:
+        (submission, name_graph, kind) = result.key
+        marks[submission][(name_graph, kind)] = (result.valid, result.size)
+    if stats is not None:
+        stats.update(instance_stats(results, lambda key: key[1]))
+
+    for outcome in solve_all(runs, concurrency = MZN_CONCURRENCY, time_limit = MZN_TIME_LIMIT,
+                             flat_dir = flat_dir):
+        (submission, name_graph) = outcome.key
+        (graph, nodes_list) = graphs[name_graph]
+        burning_seq = None
+        if outcome.result is not None:
+            burning_seq = minizinc_burn_seq(outcome.result, nodes_list)
+        if burning_seq is None:
+            marks[submission][(name_graph, "mzn")] = (False, None)
+        else:
+            marks[submission][(name_graph, "mzn")] = (is_a_burning_seq(graph, burning_seq), len(burning_seq))
+        note = mzn_note(outcome, burning_seq)
+        if note is not None:
+            print("mzn " + name_graph + " (" + submission + "): " + note)
+            if mzn_notes is not None:
+                mzn_notes[(submission, name_graph)] = note
+    return marks
+
+
+# why a MiniZinc run was marked as it was, or None for a search that finished
+# with a sequence; a missing minizinc or a model that fails to compile is an
+# error, not a wrong model
+def mzn_note(outcome, burning_seq):
+    if outcome.error is not None:
+        return "error: " + outcome.error
+    if outcome.result is None:
+        if outcome.cut_off:
+            return "no solution before the time limit"
+        return "no solution, status " + outcome.status
+    if burning_seq is None:
+        return "no burning sequence in the output"
+    if outcome.cut_off:
+        return "cut off at the time limit, marked on the best sequence found"
+    return None
+
+def skeleton_runs():
+    stats = {}
+    result_dict = mark_submissions([SUBMISSION], stats = stats)[SUBMISSION]
     print(result_dict)
+    if RUNTIME_PRINTING:
+        for name_graph in stats:
+            print(format_summary(name_graph, stats[name_graph]))
 skeleton_runs()
 
                                           
@@ -0,0 +1,5 @@
+"""Shared helpers for the automarking scripts under assignments/ and pre-2025-assessments/.
+
+The marking scripts are run from their own directories, so they put
+course_documents/assessments on sys.path before importing from here.
+"""
@@ -0,0 +1,107 @@
+"""Validate a whole cohort of candidate solutions against one instance at once.
+
+Candidates are packed into bitsets, one bit per candidate, so each vertex
+carries a row of 64-bit words saying which candidates have reached it.  A
+breadth-first step for every candidate at once is then a single numpy OR over
+the neighbour lists, and the graph is walked k times (dominating sets) or once
+per turn (burning sequences) however many candidates there are.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from marking.csr import as_csr
+
+# valid: bool array, valid[c] says whether candidate c is a solution
+# sizes: int array, the number of distinct graph vertices in each dominating
+#   set, or the length of each burning sequence
+BatchResult = namedtuple("BatchResult", ["valid", "sizes"])
+
+
+# candidates is either a (C, n) boolean matrix with columns in graph order, or
+# a list of C collections of vertex labels; labels not in graph are ignored
+def candidate_matrix(graph, candidates):
+    graph = as_csr(graph)
+    if isinstance(candidates, np.ndarray):
+        if candidates.ndim != 2 or candidates.shape[1] != graph.n:
+            raise ValueError("candidate matrix must have one column per vertex")
+        return candidates.astype(bool, copy=False)
+    matrix = np.zeros((len(candidates), graph.n), dtype=bool)
+    for row, candidate in enumerate(candidates):
+        indices = [i for i in map(graph.index, candidate) if i is not None]
+        matrix[row, indices] = True
+    return matrix
+
+
+# (C, n) booleans -> (n, W) uint64 words holding bit c of vertex v's row
+def _pack(matrix):
+    count, n = matrix.shape
+    words = max(1, -(-count // 64))
+    packed = np.zeros((n, words * 8), dtype=np.uint8)
+    packed[:, :-(-count // 8)] = np.packbits(matrix.T, axis=1, bitorder="little")
+    return packed.view(np.uint64)
+
+
+def _unpack(words, count):
+    return np.unpackbits(words.view(np.uint8), bitorder="little")[:count].astype(bool)
+
+
+# ORs each vertex's neighbours' words into its own, in place; returns whether
+# anything changed
+def _spread(masks, neighbours, starts, has_neighbours):
+    if not len(starts):
+        return False
+    reached = np.bitwise_or.reduceat(masks[neighbours], starts, axis=0)
+    updated = masks[has_neighbours] | reached
+    if np.array_equal(updated, masks[has_neighbours]):
+        return False
+    masks[has_neighbours] = updated
+    return True
+
+
+def _arrays(graph):
+    offsets = np.frombuffer(graph.offsets, dtype=np.int32)
+    neighbours = np.frombuffer(graph.neighbours, dtype=np.int32)
+    has_neighbours = offsets[:-1] < offsets[1:]
+    return neighbours, offsets[:-1][has_neighbours], has_neighbours
+
+
+def _all_reached(masks, count):
+    if not len(masks):
+        return np.ones(count, dtype=bool)
+    return _unpack(np.bitwise_and.reduce(masks, axis=0), count)
+
+
+def validate_dominating_sets(graph, candidates, k):
+    graph = as_csr(graph)
+    matrix = candidate_matrix(graph, candidates)
+    masks = _pack(matrix)
+    neighbours, starts, has_neighbours = _arrays(graph)
+    for _ in range(k):
+        if not _spread(masks, neighbours, starts, has_neighbours):
+            break
+    return BatchResult(_all_reached(masks, len(matrix)), matrix.sum(axis=1))
+
+
+# same turn order as marking.burning: spread, then light this turn's choice,
+# with one spread-only turn after each sequence's last choice
+def validate_burning_seqs(graph, sequences):
+    graph = as_csr(graph)
+    count = len(sequences)
+    lengths = np.array([len(seq) for seq in sequences], dtype=np.int64)
+    valid = np.zeros(count, dtype=bool)
+    masks = _pack(np.zeros((count, graph.n), dtype=bool))
+    bytes_view = masks.view(np.uint8)
+    neighbours, starts, has_neighbours = _arrays(graph)
+    turns = int(lengths.max()) + 1 if count else 0
+    for turn in range(1, turns + 1):
+        _spread(masks, neighbours, starts, has_neighbours)
+        finished = np.flatnonzero(lengths == turn - 1)
+        if len(finished):
+            valid[finished] = _all_reached(masks, count)[finished]
+        for c in np.flatnonzero(lengths >= turn):
+            vertex = sequences[c][turn - 1]
+            i = graph.index(vertex) if vertex is not None else None
+            if i is not None:
+                bytes_view[i, c // 8] |= 1 << (c % 8)
+    return BatchResult(valid, lengths)
@@ -0,0 +1,320 @@
+"""Scaling benchmark for the ILP submissions and the validators.
+
+Graphs from each family are generated at geometrically growing sizes, and
+every submission's run_ilp is timed on each of them through marking.driver,
+so one that hangs or runs out of memory only loses its own point.  assign-2
+runs once per distance k.  Every solution that comes back is checked, and the
+check is timed as well.  Rows go to JSON (with the fits) and optionally CSV.
+For each series the exponent b of seconds ~ a * n^b is fitted by least squares
+on log-log points.  Given a baseline JSON file from an earlier run, the rows
+that got slower or stopped solving are reported as regressions.  With
+--backends, the assign-2 reference is also run with each solver backend, and
+the fastest backend for each family is reported and kept in the JSON;
+--burn-formulations runs the assign-3 reference's burning models side by
+side.
+
+    python -m marking.bench --out bench.json --csv bench.csv
+    python -m marking.bench --out new.json --baseline bench.json
+    python -m marking.bench --skip assign-2 assign-3 --backends SCIP CBC CP-SAT/8
+    python -m marking.bench --skip assign-2 --families ladder grid --burn-formulations time balls balls-scip
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import time
+from functools import partial
+
+import networkx as nx
+
+from marking.burning import is_a_burning_seq
+from marking.domination import distance_dominates
+from marking.driver import NO_RESULT, OK, Job, call_submission, load_submission, run_jobs
+
+ASSIGNMENTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assignments")
+
+DOM_SUBMISSIONS = {
+    "reference": os.path.join(ASSIGNMENTS, "assign-2", "submitted_dist_dom_solution.py"),
+    "submitted_1": os.path.join(ASSIGNMENTS, "assign-2", "submitted_dist_dom_solution_1.py"),
+    "submitted_n": os.path.join(ASSIGNMENTS, "assign-2", "submitted_dist_dom_solution_n.py"),
+}
+BURN_SUBMISSIONS = {
+    "reference": os.path.join(ASSIGNMENTS, "assign-3", "submitted_graph_burning_solution.py"),
+}
+# the reference's burning formulations (see marking.burn_cp), for
+# --burn-formulations; the time-expanded model keeps the plain name
+BURN_FORMULATIONS = {
+    "time": ("", {}),
+    "balls": ("/balls", {"formulation": "balls"}),
+    "balls-scip": ("/balls-scip", {"formulation": "balls", "backend": "SCIP"}),
+}
+
+# each family takes a target number of vertices and a seed; the graph may be
+# slightly smaller so that it has the family's shape
+FAMILIES = {
+    "path": lambda n, seed: nx.path_graph(n),
+    "cycle": lambda n, seed: nx.cycle_graph(max(3, n)),
+    "ladder": lambda n, seed: nx.ladder_graph(max(1, n // 2)),
+    "grid": lambda n, seed: nx.grid_2d_graph(max(1, math.isqrt(n)), max(1, math.isqrt(n))),
+    "balanced_tree": lambda n, seed: nx.balanced_tree(2, max(1, int(math.log2(n + 1)) - 1)),
+    "random_regular": lambda n, seed: nx.random_regular_graph(3, max(4, n + n % 2), seed=seed),
+    # expected degree 2 ln n, so the graphs are almost always connected
+    "erdos_renyi": lambda n, seed: nx.gnp_random_graph(n, min(1.0, 2 * math.log(max(n, 2)) / n), seed=seed),
+}
+
+# rows slower than tolerance times the baseline are regressions, unless both
+# times are under NOISE_FLOOR seconds
+TOLERANCE = 1.5
+NOISE_FLOOR = 0.05
+
+
+def geometric_sizes(smallest, largest, factor=2):
+    sizes = []
+    size = smallest
+    while size <= largest:
+        sizes.append(size)
+        size = max(size + 1, int(round(size * factor)))
+    return sizes
+
+
+# [(family, graph)] for every family at every size
+def family_instances(families, sizes, seed=0):
+    return [(family, FAMILIES[family](size, seed)) for family in families for size in sizes]
+
+
+# runs in the worker, so the time is run_ilp's alone, without the fork
+def _timed(path, *args, **kwargs):
+    started = time.perf_counter()
+    result = call_submission(path, "run_ilp", *args, **kwargs)
+    return {"result": result, "seconds": time.perf_counter() - started}
+
+
+def _size_only(timed):
+    result = timed["result"]
+    return (result is not None, None)
+
+
+def _case_row(task, solver, family, graph, k):
+    return {"task": task, "solver": solver, "family": family, "n": graph.number_of_nodes(),
+            "m": graph.number_of_edges(), "k": k}
+
+
+# cases are (row, graph, path, run_ilp args, run_ilp kwargs, check) where
+# check(graph, result) -> (valid, size) is what gets timed as the validator
+def _run_cases(cases, timeout, workers, memory_limit):
+    for path in {case[2] for case in cases}:
+        load_submission(path)   # imported once here, so every forked worker starts with it
+    jobs = [Job(index, partial(_timed, path, *args, **kwargs), _size_only)
+            for index, (_, _, path, args, kwargs, _) in enumerate(cases)]
+    rows = []
+    for (row, graph, _, _, _, check), job in zip(cases, run_jobs(jobs, workers=workers, timeout=timeout + 5,
+                                                                 memory_limit=memory_limit)):
+        row = dict(row, outcome=job.outcome, seconds=None, valid=False, size=None,
+                   validate_seconds=None, peak_rss=job.peak_rss, cpu_time=job.cpu_time)
+        if job.outcome == OK and job.result["result"] is None:
+            row["outcome"] = NO_RESULT
+        elif job.outcome == OK:
+            row["seconds"] = job.result["seconds"]
+            started = time.perf_counter()
+            row["valid"], row["size"] = check(graph, job.result["result"])
+            row["validate_seconds"] = time.perf_counter() - started
+        rows.append(row)
+    return rows
+
+
+def _check_dom_set(k, graph, result):
+    dom_set = result["dom_set"]
+    return (distance_dominates(graph, dom_set, k), len(dom_set))
+
+
+def _check_burn_seq(graph, result):
+    burn_seq = result["burn_seq"]
+    return (is_a_burning_seq(graph, burn_seq), len(burn_seq))
+
+
+# timeout is in seconds, passed to run_ilp in ms; one worker at a time by
+# default so the timings do not compete for cores
+def bench_dominating_set(instances, distances, submissions=DOM_SUBMISSIONS, timeout=60.0, workers=1,
+                         memory_limit=None):
+    cases = []
+    for family, graph in instances:
+        for k in distances:
+            for name, path in submissions.items():
+                cases.append((_case_row("assign-2", name, family, graph, k), graph, path, (graph,),
+                              {"distance": k, "timeout": int(timeout * 1000)}, partial(_check_dom_set, k)))
+    return _run_cases(cases, timeout, workers, memory_limit)
+
+
+# the reference run_ilp once per backend (see marking.dom_backends); rows have
+# task "backends" and the backend name as the solver
+def bench_backends(instances, distances, backends, timeout=60.0, workers=1, memory_limit=None):
+    path = DOM_SUBMISSIONS["reference"]
+    cases = []
+    for family, graph in instances:
+        for k in distances:
+            for backend in backends:
+                cases.append((_case_row("backends", backend, family, graph, k), graph, path, (graph,),
+                              {"distance": k, "timeout": int(timeout * 1000), "backend": backend},
+                              partial(_check_dom_set, k)))
+    return _run_cases(cases, timeout, workers, memory_limit)
+
+
+# {family: backend} for the backend rows: the one that solved the most of the
+# family's cases validly, and of those the least total time on them
+def fastest_backends(rows):
+    totals = {}
+    for row in rows:
+        if row["task"] != "backends":
+            continue
+        solved, seconds = totals.get((row["family"], row["solver"]), (0, 0.0))
+        if row["valid"]:
+            solved, seconds = solved + 1, seconds + row["seconds"]
+        totals[(row["family"], row["solver"])] = (solved, seconds)
+    best = {}
+    for (family, backend), (solved, seconds) in sorted(totals.items()):
+        if family not in best or (-solved, seconds) < best[family][1]:
+            best[family] = (backend, (-solved, seconds))
+    return {family: backend for family, (backend, _) in best.items()}
+
+
+# formulations are {suffix: extra run_ilp kwargs}; a row's solver is the
+# submission name plus the suffix
+def bench_burning(instances, submissions=BURN_SUBMISSIONS, timeout=60.0, workers=1, memory_limit=None,
+                  formulations=None):
+    formulations = formulations or {"": {}}
+    cases = []
+    for family, graph in instances:
+        for name, path in submissions.items():
+            for suffix, kwargs in formulations.items():
+                cases.append((_case_row("assign-3", name + suffix, family, graph, None), graph, path, (graph,),
+                              dict(kwargs, timeout=int(timeout * 1000)), _check_burn_seq))
+    return _run_cases(cases, timeout, workers, memory_limit)
+
+
+def _series_key(row):
+    return (row["task"], row["solver"], row["family"], row["k"])
+
+
+# least-squares slope of log(metric) against log(n) for every series with at
+# least two distinct sizes measured
+def scaling_exponents(rows, metric="seconds"):
+    series = {}
+    for row in rows:
+        if row.get(metric) and row[metric] > 0 and row["n"] > 0:
+            series.setdefault(_series_key(row), []).append((math.log(row["n"]), math.log(row[metric])))
+    fits = []
+    for key, points in series.items():
+        if len({x for x, _ in points}) < 2:
+            continue
+        mean_x = sum(x for x, _ in points) / len(points)
+        mean_y = sum(y for _, y in points) / len(points)
+        slope = (sum((x - mean_x) * (y - mean_y) for x, y in points)
+                 / sum((x - mean_x) ** 2 for x, _ in points))
+        task, solver, family, k = key
+        fits.append({"task": task, "solver": solver, "family": family, "k": k, "metric": metric,
+                     "exponent": slope, "points": len(points)})
+    return fits
+
+
+def _row_key(row):
+    return _series_key(row) + (row["n"],)
+
+
+# rows of results that got more than tolerance times slower than the matching
+# baseline row, or that solved validly in the baseline but not now
+def compare(results, baseline, tolerance=TOLERANCE, noise_floor=NOISE_FLOOR):
+    before = {_row_key(row): row for row in baseline}
+    regressions = []
+    for row in results:
+        old = before.get(_row_key(row))
+        if old is None:
+            continue
+        if old["valid"] and not row["valid"]:
+            regressions.append(dict(row, reason="no longer solved (" + row["outcome"] + ")",
+                                    baseline_seconds=old["seconds"]))
+        elif (row["valid"] and old["valid"] and row["seconds"] > noise_floor
+              and row["seconds"] > tolerance * old["seconds"]):
+            regressions.append(dict(row, reason="%.2fx slower" % (row["seconds"] / old["seconds"]),
+                                    baseline_seconds=old["seconds"]))
+    return regressions
+
+
+COLUMNS = ["task", "solver", "family", "n", "m", "k", "outcome", "valid", "size", "seconds",
+           "validate_seconds", "cpu_time", "peak_rss"]
+
+
+def write_json(path, rows, fits, fastest=None):
+    with open(path, "w") as out:
+        json.dump({"rows": rows, "fits": fits, "fastest_backends": fastest or {}}, out, indent=1)
+
+
+def read_rows(path):
+    with open(path) as source:
+        return json.load(source)["rows"]
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as out:
+        writer = csv.DictWriter(out, fieldnames=COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default="bench.json")
+    parser.add_argument("--csv")
+    parser.add_argument("--baseline", help="JSON from an earlier run to compare against")
+    parser.add_argument("--families", nargs="+", default=list(FAMILIES), choices=list(FAMILIES))
+    parser.add_argument("--dom-sizes", nargs=2, type=int, default=[16, 256], metavar=("SMALLEST", "LARGEST"))
+    parser.add_argument("--burn-sizes", nargs=2, type=int, default=[8, 64], metavar=("SMALLEST", "LARGEST"))
+    parser.add_argument("--factor", type=float, default=2)
+    parser.add_argument("--distances", nargs="+", type=int, default=[1, 2, 4])
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds per run_ilp call")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--memory-limit", type=int, help="bytes of address space per run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip", nargs="+", default=[], choices=["assign-2", "assign-3"])
+    parser.add_argument("--burn-formulations", nargs="+", default=["time"], choices=list(BURN_FORMULATIONS),
+                        help="assign-3 reference models to run side by side")
+    parser.add_argument("--backends", nargs="+", default=[],
+                        help="also run the assign-2 reference with each of these backends (e.g. SCIP CBC CP-SAT/8) "
+                             "and report the fastest per family")
+    args = parser.parse_args(argv)
+
+    rows = []
+    if "assign-2" not in args.skip:
+        instances = family_instances(args.families, geometric_sizes(*args.dom_sizes, args.factor), args.seed)
+        rows += bench_dominating_set(instances, args.distances, timeout=args.timeout, workers=args.workers,
+                                     memory_limit=args.memory_limit)
+    if "assign-3" not in args.skip:
+        instances = family_instances(args.families, geometric_sizes(*args.burn_sizes, args.factor), args.seed)
+        formulations = dict(BURN_FORMULATIONS[name] for name in args.burn_formulations)
+        rows += bench_burning(instances, timeout=args.timeout, workers=args.workers,
+                              memory_limit=args.memory_limit, formulations=formulations)
+    if args.backends:
+        instances = family_instances(args.families, geometric_sizes(*args.dom_sizes, args.factor), args.seed)
+        rows += bench_backends(instances, args.distances, args.backends, timeout=args.timeout,
+                               workers=args.workers, memory_limit=args.memory_limit)
+    fits = scaling_exponents(rows) + scaling_exponents(rows, "validate_seconds")
+    fastest = fastest_backends(rows)
+    write_json(args.out, rows, fits, fastest)
+    if args.csv:
+        write_csv(args.csv, rows)
+    for fit in fits:
+        print("%(task)s %(solver)s %(family)s k=%(k)s %(metric)s ~ n^%(exponent).2f (%(points)d sizes)" % fit)
+    for family, backend in sorted(fastest.items()):
+        print("fastest backend for %s: %s" % (family, backend))
+
+    if args.baseline:
+        regressions = compare(rows, read_rows(args.baseline))
+        for row in regressions:
+            print("REGRESSION %(task)s %(solver)s %(family)s n=%(n)s k=%(k)s: %(reason)s" % row)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+"""CP-SAT and MIP engines for the graph burning reference solution.
+
+TimeExpandedBurning is the CSP1 time-expanded model (burned[i, j] says vertex
+i is burning by the end of round j), built once for the largest horizon
+B_max that will be tried.  Which horizon B is asked about is chosen by the
+literal last[B], exactly one of which is true: rounds up to B each light
+exactly one vertex, later rounds light none, and every vertex must be
+burning at the end of round B.  A probe of B pins last[B] in the model's
+variable domains (rather than passing it as an assumption, which presolve
+could not use to drop the later rounds) and solves the same model, hinted
+with the last solution found.  So a search over B builds the model once
+rather than once per probe; or one solve can minimise the horizon directly.
+
+burn_ball_cover instead uses the characterisation by balls: B rounds are
+enough iff there are sources s_1..s_B whose balls of radius B - i together
+cover every vertex.  That model has n * B variables and one clause per
+vertex, with no per-round spreading constraints, and is solved by CP-SAT or
+a pywraplp MIP solver.
+
+In both, as in the original model, the source lit in round j has B - j
+rounds to spread, so the last one burns only itself.  CP-SAT runs workers
+search threads, by default marking.dom_backends.CP_SAT_WORKERS, or one in a
+marking.driver worker.
+"""
+import time
+
+from ortools.sat.python import cp_model
+
+from marking.burning import is_a_burning_seq
+from marking.csr import as_csr
+from marking.dom_backends import CP_SAT_WORKERS
+from marking.driver import solver_workers
+from marking.domination import DominationOracle
+from marking.stats import cp_sat_size, mip_stats, new_stats, phase
+
+
+class TimeExpandedBurning:
+    def __init__(self, graph, b_max, workers=None):
+        self.graph = as_csr(graph)
+        self.b_max = b_max
+        self.workers = workers or solver_workers(CP_SAT_WORKERS)
+        self.model = cp_model.CpModel()
+        self._solution = None
+        n = self.graph.n
+        model = self.model
+        rounds = range(1, b_max + 1)
+
+        # decision[i, j]: vertex i is ignited at round j (1..B_max)
+        self.decision = {(i, j): model.NewBoolVar("decision_%d_%d" % (i, j)) for i in range(n) for j in rounds}
+        # burned[i, j]: vertex i is burned by end of round j (0..B_max)
+        self.burned = {(i, j): model.NewBoolVar("burned_%d_%d" % (i, j)) for i in range(n) for j in range(b_max + 1)}
+        # last[j]: the horizon is j; active[j]: round j is within the horizon
+        self.last = {j: model.NewBoolVar("last_%d" % j) for j in rounds}
+        active = {j: model.NewBoolVar("active_%d" % j) for j in rounds}
+        model.AddExactlyOne(self.last.values())
+        for j in rounds:
+            model.Add(active[j] == sum(self.last[h] for h in range(j, b_max + 1)))
+
+        decision = self.decision
+        burned = self.burned
+        for i in range(n):
+            neighbours = [k for k in self.graph.adjacent(i) if k != i]
+            # initial state with no burned vertices
+            model.Add(burned[i, 0] == 0)
+            for j in rounds:
+                # a burned vertex stays burned
+                model.AddImplication(burned[i, j - 1], burned[i, j])
+                # an ignited vertex is burned
+                model.AddImplication(decision[i, j], burned[i, j])
+                # fire spreads to the neighbours
+                for k in neighbours:
+                    model.AddImplication(burned[k, j - 1], burned[i, j])
+                # and nothing else sets a vertex alight
+                model.AddBoolOr([burned[i, j - 1], decision[i, j]]
+                                + [burned[k, j - 1] for k in neighbours]).OnlyEnforceIf(burned[i, j])
+            # a vertex is ignited at most once
+            model.AddAtMostOne(decision[i, j] for j in rounds)
+
+        for j in rounds:
+            # one vertex is ignited in each round of the horizon, none after it
+            model.Add(sum(decision[i, j] for i in range(n)) == 1).OnlyEnforceIf(active[j])
+            model.Add(sum(decision[i, j] for i in range(n)) == 0).OnlyEnforceIf(active[j].Not())
+            # every vertex is burned at the end of the horizon
+            model.AddBoolAnd([burned[i, j] for i in range(n)]).OnlyEnforceIf(self.last[j])
+            # before the last round, only an unburned vertex may be ignited
+            if j < b_max:
+                for i in range(n):
+                    model.AddImplication(decision[i, j], burned[i, j - 1].Not()).OnlyEnforceIf(active[j + 1])
+
+    # the ignition sequence of a solved model, in labels
+    def _sequence(self, solver, horizon):
+        labels = self.graph.labels
+        sequence = []
+        for j in range(1, horizon + 1):
+            sequence.append(next((labels[i] for i in range(self.graph.n) if solver.Value(self.decision[i, j])),
+                                 None))
+        return sequence
+
+    def _hint_last_solution(self):
+        self.model.ClearHints()
+        if self._solution is not None:
+            for variable, value in self._solution:
+                self.model.AddHint(variable, value)
+
+    def _solve(self, timeout_ms, stats):
+        self._hint_last_solution()
+        solver = cp_model.CpSolver()
+        if timeout_ms:
+            solver.parameters.max_time_in_seconds = timeout_ms / 1000.0
+        solver.parameters.num_workers = self.workers
+        with phase(stats, "solve_time"):
+            status = solver.Solve(self.model)
+        stats["status"] = solver.StatusName(status)
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            variables = list(self.decision.values()) + list(self.burned.values()) + list(self.last.values())
+            self._solution = [(variable, solver.Value(variable)) for variable in variables]
+            return solver
+        return None
+
+    # a burning sequence of length B, or None if the solver proves there is
+    # none (stats["status"] INFEASIBLE) or finds none within timeout_ms
+    def probe(self, B, timeout_ms=None, stats=None):
+        if not 1 <= B <= self.b_max:
+            raise ValueError("horizon must be between 1 and " + str(self.b_max))
+        stats = stats if stats is not None else new_stats()
+        self.model.ClearObjective()
+        self._fix_horizon(B)
+        try:
+            solver = self._solve(timeout_ms, stats)
+        finally:
+            self._fix_horizon(None)
+        return None if solver is None else self._sequence(solver, B)
+
+    # pins last[B] true and the others false in the model's domains (which,
+    # unlike assumptions, presolve can use to drop the rounds after B);
+    # None frees them again
+    def _fix_horizon(self, B):
+        proto = self.model.Proto()
+        for j, last in self.last.items():
+            domain = proto.variables[last.Index()].domain
+            domain[0], domain[1] = (0, 1) if B is None else (int(j == B), int(j == B))
+
+    # the shortest burning sequence the solver finds within timeout_ms, or
+    # None; stats["best_bound"] is the proven lower bound on its length
+    def minimise(self, timeout_ms=None, stats=None):
+        stats = stats if stats is not None else new_stats()
+        self.model.Minimize(sum(j * last for j, last in self.last.items()))
+        solver = self._solve(timeout_ms, stats)
+        if solver is None:
+            return None
+        horizon = round(solver.ObjectiveValue())
+        stats["best_bound"] = max(stats["best_bound"] or 1, round(solver.BestObjectiveBound()))
+        return self._sequence(solver, horizon)
+
+
+# binary search of the horizons 1..b_max with probe(B) -> sequence or None;
+# (best sequence or None) with stats["best_bound"] raised past every B the
+# probe proved INFEASIBLE
+def _search_horizon(graph, b_max, probe, stats):
+    best_seq = None
+    lower_bound, upper_bound = 1, b_max
+    while lower_bound <= upper_bound:
+        B = (lower_bound + upper_bound) // 2
+        seq = probe(B)
+        if stats["status"] == "INFEASIBLE":
+            stats["best_bound"] = max(stats["best_bound"], B + 1)
+        # accept B only if the sequence really burns the whole graph
+        if seq is not None and is_a_burning_seq(graph, seq):
+            best_seq = seq
+            upper_bound = B - 1
+        else:
+            lower_bound = B + 1
+    return best_seq
+
+
+def _result(best_seq, stats):
+    if best_seq is None:
+        return None
+    stats["objective"] = len(best_seq)
+    stats["status"] = "OPTIMAL" if stats["best_bound"] >= len(best_seq) else "FEASIBLE"
+    return {"burn_seq": best_seq, "stats": stats}
+
+
+def _new_burning_stats():
+    stats = new_stats()
+    # the burning number is at least one more than any B proven infeasible
+    stats["best_bound"] = 1
+    return stats
+
+
+# run_ilp's result for a graph with at least two vertices, searching horizons
+# up to b_max: {'burn_seq': labels, 'stats': stats}, or None if nothing is
+# found.  With minimise one solve minimises the horizon; otherwise B is
+# binary searched, each probe of the one model getting timeout ms.
+def burn_time_expanded(graph, b_max, timeout=1000, workers=None, minimise=False):
+    stats = _new_burning_stats()
+    with phase(stats, "preprocess_time"):
+        graph = as_csr(graph)
+    build_started = time.perf_counter()
+    engine = TimeExpandedBurning(graph, b_max, workers)
+    stats["build_time"] = time.perf_counter() - build_started
+    stats["variables"], stats["constraints"], stats["nonzeros"] = cp_sat_size(engine.model)
+
+    if minimise:
+        best_seq = engine.minimise(timeout, stats)
+        if best_seq is not None and not is_a_burning_seq(graph, best_seq):
+            best_seq = None
+    else:
+        best_seq = _search_horizon(graph, b_max, lambda B: engine.probe(B, timeout, stats), stats)
+    return _result(best_seq, stats)
+
+
+# cover[u] for horizon B: the (v, i) such that a source v lit in round i
+# reaches u, that is u is in v's ball of radius B - i (the graph being
+# undirected, v is then in u's ball of that radius)
+def ball_cover_rows(oracle, B):
+    return [[(v, i) for i in range(1, B + 1) for v in oracle.ball_indices(u, B - i)]
+            for u in range(oracle.graph.n)]
+
+
+def _ball_cover_cp_sat(n, B, cover, timeout_ms, workers, stats):
+    model = cp_model.CpModel()
+    with phase(stats, "build_time"):
+        source = {(v, i): model.NewBoolVar("source_%d_%d" % (v, i)) for v in range(n) for i in range(1, B + 1)}
+        for i in range(1, B + 1):
+            model.AddExactlyOne(source[v, i] for v in range(n))
+        # the rounds' radii all differ, so the only symmetry left is a vertex
+        # lit twice, which never helps: its larger ball holds the smaller
+        for v in range(n):
+            model.AddAtMostOne(source[v, i] for i in range(1, B + 1))
+        for row in cover:
+            model.AddBoolOr([source[pair] for pair in row])
+    for key, size in zip(("variables", "constraints", "nonzeros"), cp_sat_size(model)):
+        stats[key] = max(stats[key] or 0, size)
+    solver = cp_model.CpSolver()
+    if timeout_ms:
+        solver.parameters.max_time_in_seconds = timeout_ms / 1000.0
+    solver.parameters.num_workers = workers or solver_workers(CP_SAT_WORKERS)
+    with phase(stats, "solve_time"):
+        status = solver.Solve(model)
+    stats["status"] = solver.StatusName(status)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None
+    return [next(v for v in range(n) if solver.Value(source[v, i])) for i in range(1, B + 1)]
+
+
+def _ball_cover_mip(solver_id, n, B, cover, timeout_ms, stats):
+    from ortools.linear_solver import pywraplp
+
+    solver = pywraplp.Solver.CreateSolver(solver_id)
+    if not solver:
+        raise ValueError("ortools has no " + solver_id + " solver here")
+    if timeout_ms:
+        solver.SetTimeLimit(int(timeout_ms))
+    with phase(stats, "build_time"):
+        source = {(v, i): solver.BoolVar("source_%d_%d" % (v, i)) for v in range(n) for i in range(1, B + 1)}
+        for i in range(1, B + 1):
+            solver.Add(solver.Sum([source[v, i] for v in range(n)]) == 1)
+        for v in range(n):
+            solver.Add(solver.Sum([source[v, i] for i in range(1, B + 1)]) <= 1)
+        for row in cover:
+            solver.Add(solver.Sum([source[pair] for pair in row]) >= 1)
+    with phase(stats, "solve_time"):
+        status = solver.Solve()
+    sizes = new_stats()
+    mip_stats(sizes, solver, status)
+    for key in ("variables", "constraints", "nonzeros"):
+        stats[key] = max(stats[key] or 0, sizes[key])
+    stats["status"] = sizes["status"]
+    if status not in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE):
+        return None
+    return [next(v for v in range(n) if source[v, i].solution_value() > 0.5) for i in range(1, B + 1)]
+
+
+# run_ilp's result by the ball-covering characterisation: the graph burns in
+# B rounds iff some sources s_1..s_B have balls of radius B - i covering every
+# vertex.  Balls come from truncated breadth-first searches, kept (layer by
+# layer) across the probes of the binary search over B, each probe getting
+# timeout ms.  backend is "CP-SAT" or one of the pywraplp MIP solvers.
+def burn_ball_cover(graph, b_max, timeout=1000, workers=None, backend="CP-SAT"):
+    stats = _new_burning_stats()
+    with phase(stats, "preprocess_time"):
+        graph = as_csr(graph)
+        oracle = DominationOracle(graph)
+    labels = graph.labels
+
+    def probe(B):
+        with phase(stats, "preprocess_time"):
+            cover = ball_cover_rows(oracle, B)
+        if backend == "CP-SAT":
+            sources = _ball_cover_cp_sat(graph.n, B, cover, timeout, workers, stats)
+        else:
+            sources = _ball_cover_mip(backend, graph.n, B, cover, timeout, stats)
+        return None if sources is None else [labels[v] for v in sources]
+
+    return _result(_search_horizon(graph, b_max, probe, stats), stats)
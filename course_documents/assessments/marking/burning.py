@@ -0,0 +1,52 @@
+"""Graph burning simulation used by the graph burning marker.
+
+Turn t (counting from 1) first spreads fire from every burning vertex to its
+neighbours and then lights burning_seq[t - 1].  After the last choice there is
+one more spread-only turn, as in the original marker.  Only the vertices that
+caught fire on the previous turn can set anything new alight, so the
+simulation spreads from that frontier alone and does O(n + m) work in total.
+"""
+from collections import namedtuple
+
+from marking.csr import as_csr
+
+# rounds: rounds[t - 1] lists the vertices that caught fire on turn t, by
+#   spreading first and then the chosen vertex if it was not already burning
+# burned_at: the first turn by the end of which every vertex is burning
+#   (0 for an empty graph), or None if the sequence never burns the graph
+BurningTrace = namedtuple("BurningTrace", ["rounds", "burned_at"])
+
+
+# entries of burning_seq that are None or not vertices of graph light nothing
+def simulate_burning(graph, burning_seq):
+    graph = as_csr(graph)
+    offsets = graph.offsets
+    neighbours = graph.neighbours
+    labels = graph.labels
+    burning = bytearray(graph.n)
+    unburned = graph.n
+    burned_at = 0 if unburned == 0 else None
+    frontier = []
+    rounds = []
+    for turn in range(1, len(burning_seq) + 2):
+        caught = []
+        for u in frontier:
+            for w in neighbours[offsets[u]:offsets[u + 1]]:
+                if not burning[w]:
+                    burning[w] = 1
+                    caught.append(w)
+        if turn <= len(burning_seq) and burning_seq[turn - 1] is not None:
+            source = graph.index(burning_seq[turn - 1])
+            if source is not None and not burning[source]:
+                burning[source] = 1
+                caught.append(source)
+        frontier = caught
+        unburned -= len(caught)
+        rounds.append([labels[v] for v in caught])
+        if burned_at is None and unburned == 0:
+            burned_at = turn
+    return BurningTrace(rounds, burned_at)
+
+
+def is_a_burning_seq(graph, burning_seq):
+    return simulate_burning(graph, burning_seq).burned_at is not None
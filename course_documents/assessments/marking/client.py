@@ -0,0 +1,105 @@
+"""Thin client for the marking daemon (see marking.daemon).
+
+Only the standard library is imported here, so a marker script that hands
+itself to a running daemon pays for nothing but the interpreter: its own
+imports, parsing and checking all happen in the daemon's warm fork.
+Forwarding is opt-in: a script only looks for a daemon when MARKING_DAEMON is
+set, and with no daemon listening it just carries on and runs as before.
+Requests and replies are marshal-encoded dicts, marshal being built in and so
+free to import, unlike json.
+
+A reply is only trusted from the same user: the socket must sit in a
+directory its owner alone can enter, and the peer's uid is checked with
+SO_PEERCRED.  Each request also carries code_version(), and a daemon whose
+preloaded marking modules have since changed on disk refuses it, so the
+script runs here on the current code instead.
+"""
+import marshal
+import os
+import socket
+import stat
+import sys
+
+PACKAGE = os.path.dirname(os.path.abspath(__file__))
+
+# set in the daemon's forked children, so a script run there does not forward
+# itself again
+in_daemon = False
+
+
+# $XDG_RUNTIME_DIR/marking, else marking-<uid> in $TMPDIR or /tmp; made 0700 by
+# the daemon
+def private_dir():
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, "marking")
+    return os.path.join(os.environ.get("TMPDIR", "/tmp"), "marking-" + str(os.getuid()))
+
+
+def socket_path():
+    return os.environ.get("MARKING_SOCKET", os.path.join(private_dir(), "daemon.sock"))
+
+
+# True if path sits in a real directory of ours that no one else can enter
+def in_private_dir(path):
+    try:
+        info = os.lstat(os.path.dirname(os.path.abspath(path)))
+    except FileNotFoundError:
+        return False
+    return stat.S_ISDIR(info.st_mode) and info.st_uid == os.getuid() and not info.st_mode & 0o077
+
+
+# the uid at the other end of a Unix socket, or None where the platform cannot
+# tell (SO_PEERCRED is Linux only)
+def peer_uid(connection):
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    credentials = connection.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, 12)   # pid, uid, gid
+    return int.from_bytes(credentials[4:8], sys.byteorder)
+
+
+# name, mtime and size of every module in the marking package
+def code_version():
+    return sorted((entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+                  for entry in os.scandir(PACKAGE) if entry.name.endswith(".py"))
+
+
+# (exit code, stdout, stderr) of running script with argv in the daemon, or
+# None if no daemon of ours is listening on current code
+def run_in_daemon(script, argv, path=None):
+    path = path or socket_path()
+    if not in_private_dir(path):
+        return None
+    request = {"script": os.path.abspath(script), "argv": list(argv), "cwd": os.getcwd(),
+               "version": code_version()}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(path)
+            if peer_uid(connection) != os.getuid():
+                return None
+            connection.sendall(marshal.dumps(request))
+            connection.shutdown(socket.SHUT_WR)
+            reply = b"".join(iter(lambda: connection.recv(65536), b""))
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+    reply = marshal.loads(reply)
+    if reply.get("stale"):
+        sys.stderr.write("marking daemon on " + path + " predates the marking code; restart it\n")
+        return None
+    return reply["code"], reply["stdout"], reply["stderr"]
+
+
+# call before the script's own imports: with MARKING_DAEMON set and a daemon
+# running the script, its output is echoed and this process exits with its
+# code; otherwise this returns
+def forward_to_daemon(script):
+    if in_daemon or not os.environ.get("MARKING_DAEMON"):
+        return
+    answer = run_in_daemon(script, sys.argv)
+    if answer is None:
+        return
+    code, stdout, stderr = answer
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+    sys.stdout.flush()
+    sys.exit(code)
@@ -0,0 +1,91 @@
+"""Connected components of a CSRGraph, as graphs of their own.
+
+A component keeps its vertices' original labels, so anything solved on it can
+be reported against the whole graph directly.  centre_within finds a vertex
+that reaches the whole component within k steps, if a double sweep of
+breadth-first searches turns one up (always, on trees), which is a one-vertex
+dominating set for any distance k at least the component's radius.
+"""
+from array import array
+
+from marking.csr import CSRGraph, as_csr, bfs_layers
+
+
+# vertex index arrays, one per component, each in breadth-first order
+def component_indices(graph):
+    graph = as_csr(graph)
+    offsets = graph.offsets
+    neighbours = graph.neighbours
+    seen = bytearray(graph.n)
+    parts = []
+    for source in range(graph.n):
+        if seen[source]:
+            continue
+        seen[source] = 1
+        part = array("i", [source])
+        head = 0
+        while head < len(part):
+            u = part[head]
+            head += 1
+            for w in neighbours[offsets[u]:offsets[u + 1]]:
+                if not seen[w]:
+                    seen[w] = 1
+                    part.append(w)
+        parts.append(part)
+    return parts
+
+
+# the subgraph on the vertex indices of one component, numbered in part order
+def component_graph(graph, part):
+    graph = as_csr(graph)
+    local = {v: i for i, v in enumerate(part)}
+    sources = array("i")
+    targets = array("i")
+    for v in part:
+        for w in graph.adjacent(v):
+            if v <= w:
+                sources.append(local[v])
+                targets.append(local[w])
+    return CSRGraph.from_edges(len(part), sources, targets, labels=[graph.labels[v] for v in part])
+
+
+# [CSRGraph] for every component; a connected graph comes back as itself
+def components(graph):
+    graph = as_csr(graph)
+    parts = component_indices(graph)
+    if len(parts) == 1:
+        return [graph]
+    return [component_graph(graph, part) for part in parts]
+
+
+def _distances(graph, source):
+    dist = array("i", [-1]) * graph.n
+    for depth, layer in enumerate(bfs_layers(graph, [source])):
+        for v in layer:
+            dist[v] = depth
+    return dist
+
+
+def _farthest(dist):
+    return max(range(len(dist)), key=dist.__getitem__)
+
+
+# index of a vertex within distance k of every vertex of the connected graph,
+# or None if the double sweep finds none
+def centre_within(graph, k):
+    graph = as_csr(graph)
+    if graph.n == 0:
+        return None
+    from_start = _distances(graph, 0)
+    if max(from_start) <= k:
+        return 0
+    a = _farthest(from_start)
+    from_a = _distances(graph, a)
+    b = _farthest(from_a)
+    diameter = from_a[b]
+    from_b = _distances(graph, b)
+    # a vertex in the middle of a longest a-b path
+    middle = next(v for v in range(graph.n) if from_a[v] == (diameter + 1) // 2 and from_b[v] == diameter // 2)
+    if max(_distances(graph, middle)) <= k:
+        return middle
+    return None
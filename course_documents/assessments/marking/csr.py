@@ -0,0 +1,202 @@
+"""Compact immutable graph shared by the marking validators.
+
+A CSRGraph stores its adjacency as two int32 arrays: the neighbours of
+vertex i are neighbours[offsets[i]:offsets[i + 1]].  Vertices are numbered
+0..n-1 internally and keep their original names in labels (a range for .dzn
+instances, so no per-vertex objects are held at all).
+
+The validators work on the index arrays directly.  For code written against
+networkx the graph also answers nodes(), neighbors(), len(), iteration,
+membership and graph[label] in terms of the original labels.
+"""
+from array import array
+from itertools import accumulate
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class CSRGraph:
+    __slots__ = ("offsets", "neighbours", "labels", "m", "_index", "__weakref__")
+
+    def __init__(self, offsets, neighbours, labels, m):
+        if len(labels) != len(offsets) - 1:
+            raise ValueError("need one label per vertex")
+        if isinstance(labels, range):
+            index = None
+        else:
+            labels = tuple(labels)
+            index = {label: i for i, label in enumerate(labels)}
+        object.__setattr__(self, "offsets", offsets)
+        object.__setattr__(self, "neighbours", neighbours)
+        object.__setattr__(self, "labels", labels)
+        object.__setattr__(self, "m", m)
+        object.__setattr__(self, "_index", index)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CSRGraph is immutable")
+
+    def __reduce__(self):
+        return (CSRGraph, (self.offsets, self.neighbours, self.labels, self.m))
+
+    # edges are given as two parallel sequences of endpoints numbered
+    # base..base+n-1 (base=1 for .dzn arrays); labels defaults to those
+    # numbers.  Parallel edges are kept, which none of the checks care about.
+    @classmethod
+    def from_edges(cls, n, sources, targets, base=0, labels=None):
+        if len(sources) != len(targets):
+            raise ValueError("sources and targets differ in length")
+        for ends in (sources, targets):
+            if len(ends) and (min(ends) < base or max(ends) >= base + n):
+                raise ValueError("edge endpoint outside " + str(base) + ".." + str(base + n - 1))
+        if labels is None:
+            labels = range(base, base + n)
+
+        if np is not None:
+            offsets, neighbours = _csr_arrays_numpy(n, sources, targets, base)
+        else:
+            offsets, neighbours = _csr_arrays(n, sources, targets, base)
+        return cls(offsets, neighbours, labels, len(sources))
+
+    # values as read by marking.dzn.read_dzn; vertices keep their 1..n names
+    @classmethod
+    def from_dzn(cls, values):
+        return cls.from_edges(values["n"], values["from"], values["to"], base=1)
+
+    # adjacency is anything mapping each vertex to its neighbours (a networkx
+    # graph, or a dict of lists listing both directions of every edge)
+    @classmethod
+    def from_adjacency(cls, adjacency):
+        labels = list(adjacency)
+        index = {label: i for i, label in enumerate(labels)}
+        offsets = array("i", [0])
+        neighbours = array("i")
+        for label in labels:
+            neighbours.extend(index[w] for w in adjacency[label])
+            offsets.append(len(neighbours))
+        loops = sum(1 for label in labels if label in adjacency[label])
+        return cls(offsets, neighbours, labels, (len(neighbours) + loops) // 2)
+
+    # vertices are relabelled 0..n-1 in graph.nodes() order
+    @classmethod
+    def from_networkx(cls, graph):
+        if graph.is_directed():
+            graph = graph.to_undirected(as_view=True)
+        return cls.from_adjacency(graph)
+
+    @property
+    def n(self):
+        return len(self.offsets) - 1
+
+    # index of label, or None if it is not a vertex
+    def index(self, label):
+        if self._index is None:
+            return self.labels.index(label) if label in self.labels else None
+        return self._index.get(label)
+
+    def adjacent(self, i):
+        return self.neighbours[self.offsets[i]:self.offsets[i + 1]]
+
+    def degree(self, i):
+        return self.offsets[i + 1] - self.offsets[i]
+
+    # networkx-style access by label
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        return iter(self.labels)
+
+    def __contains__(self, label):
+        return self.index(label) is not None
+
+    def __getitem__(self, label):
+        i = self.index(label)
+        if i is None:
+            raise KeyError(label)
+        return [self.labels[j] for j in self.adjacent(i)]
+
+    def nodes(self):
+        return self.labels
+
+    def neighbors(self, label):
+        return iter(self[label])
+
+    def number_of_nodes(self):
+        return self.n
+
+    def number_of_edges(self):
+        return self.m
+
+
+# counting sort of the edge ends by vertex, keeping edge order within a vertex
+def _csr_arrays(n, sources, targets, base):
+    degree = array("i", [0]) * (n + 1)
+    for u, v in zip(sources, targets):
+        degree[u - base + 1] += 1
+        if u != v:
+            degree[v - base + 1] += 1
+    offsets = array("i", accumulate(degree))
+
+    neighbours = array("i", [0]) * offsets[-1]
+    fill = offsets[:-1]
+    for u, v in zip(sources, targets):
+        u -= base
+        v -= base
+        neighbours[fill[u]] = v
+        fill[u] += 1
+        if u != v:
+            neighbours[fill[v]] = u
+            fill[v] += 1
+    return offsets, neighbours
+
+
+# the same arrays as _csr_arrays, with the sort done by numpy
+def _csr_arrays_numpy(n, sources, targets, base):
+    sources = np.asarray(sources, dtype=np.int32) - base
+    targets = np.asarray(targets, dtype=np.int32) - base
+    heads = np.column_stack((sources, targets)).ravel()
+    tails = np.column_stack((targets, sources)).ravel()
+    keep = np.ones(len(heads), dtype=bool)
+    keep[1::2] = sources != targets
+    heads = heads[keep]
+    tails = tails[keep]
+
+    counts = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(np.bincount(heads, minlength=n), out=counts[1:])
+    offsets = array("i")
+    offsets.frombytes(counts.tobytes())
+    neighbours = array("i")
+    neighbours.frombytes(tails[np.argsort(heads, kind="stable")].astype(np.int32).tobytes())
+    return offsets, neighbours
+
+
+def as_csr(graph):
+    if isinstance(graph, CSRGraph):
+        return graph
+    return CSRGraph.from_networkx(graph)
+
+
+# yields the breadth-first layers around the source vertex indices: layer d is
+# every vertex index at distance exactly d from the nearest source
+def bfs_layers(graph, sources):
+    offsets = graph.offsets
+    neighbours = graph.neighbours
+    seen = bytearray(graph.n)
+    layer = []
+    for v in sources:
+        if not seen[v]:
+            seen[v] = 1
+            layer.append(v)
+    while layer:
+        yield layer
+        next_layer = []
+        for u in layer:
+            for w in neighbours[offsets[u]:offsets[u + 1]]:
+                if not seen[w]:
+                    seen[w] = 1
+                    next_layer.append(w)
+        layer = next_layer
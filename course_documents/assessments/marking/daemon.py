@@ -0,0 +1,147 @@
+"""Long-lived marking daemon: a fork server with the markers' imports done.
+
+    python -m marking.daemon [--socket PATH] [--preload MODULE ...]
+
+The daemon imports numpy, networkx and the marking modules once, then
+listens on a Unix socket in a directory only its owner can enter (see
+marking.client.private_dir), and serves only clients of its own uid, checked
+with SO_PEERCRED, so it runs on Linux.  A request made with a different
+marking.client.code_version() than the daemon started with is refused, the
+preloaded modules being stale.  Each request names a script, its argv and
+the caller's working directory.  The daemon forks, and the child runs the
+script as __main__ with those arguments, capturing what it prints and its
+exit code for the client.  A script that crashes or calls sys.exit only
+ends its own child.  Marker scripts reach the daemon through
+marking.client.forward_to_daemon when MARKING_DAEMON is set, so their
+command lines and output are unchanged.
+"""
+import argparse
+import importlib
+import io
+import marshal
+import os
+import runpy
+import signal
+import socket
+import sys
+import traceback
+
+from marking import client
+
+PRELOAD = ["numpy", "networkx", "marking.csr", "marking.domination", "marking.dzn", "marking.mzn_output",
+           "marking.burning", "marking.batch", "marking.intervals"]
+
+
+def preload(modules):
+    loaded = []
+    for name in modules:
+        try:
+            importlib.import_module(name)
+            loaded.append(name)
+        except ImportError:
+            pass
+    return loaded
+
+
+def _run_script(request):
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    code = 0
+    sys.stdout, sys.stderr = stdout, stderr
+    try:
+        os.chdir(request["cwd"])
+        sys.argv = request["argv"]
+        sys.path[0] = os.path.dirname(request["script"])
+        runpy.run_path(request["script"], run_name="__main__")
+    except SystemExit as exit_request:
+        if isinstance(exit_request.code, int) or exit_request.code is None:
+            code = exit_request.code or 0
+        else:
+            print(exit_request.code, file=stderr)
+            code = 1
+    except BaseException:
+        traceback.print_exc(file=stderr)
+        code = 1
+    finally:
+        sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+    return {"code": code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+def _handle(connection, version):
+    request = marshal.loads(b"".join(iter(lambda: connection.recv(65536), b"")))
+    if request.get("version") != version:
+        connection.sendall(marshal.dumps({"stale": True}))
+        return
+    connection.sendall(marshal.dumps(_run_script(request)))
+
+
+def _claim(path):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not client.in_private_dir(path):
+        raise RuntimeError(directory + " must be a directory only you can enter (mode 0700)")
+    if os.path.exists(path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(path)
+            except ConnectionRefusedError:
+                os.unlink(path)     # left behind by a daemon that died
+            else:
+                raise RuntimeError("a marking daemon is already listening on " + path)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_mask = os.umask(0o177)
+    try:
+        listener.bind(path)
+    finally:
+        os.umask(old_mask)
+    listener.listen(64)
+    return listener
+
+
+# serves until interrupted; children are reaped by the kernel
+def serve(path=None, modules=PRELOAD):
+    if not hasattr(socket, "SO_PEERCRED"):
+        raise RuntimeError("the marking daemon needs SO_PEERCRED to check its clients")
+    path = path or client.socket_path()
+    version = client.code_version()
+    preload(modules)
+    listener = _claim(path)
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        while True:
+            connection, _ = listener.accept()
+            if client.peer_uid(connection) != os.getuid():
+                connection.close()
+                continue
+            if os.fork() == 0:
+                code = 1
+                try:
+                    listener.close()
+                    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                    client.in_daemon = True
+                    _handle(connection, version)
+                    code = 0
+                finally:
+                    os._exit(code)
+            connection.close()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--socket", help="defaults to $MARKING_SOCKET or daemon.sock in $XDG_RUNTIME_DIR/marking, "
+                                         "else in marking-<uid> in $TMPDIR or /tmp")
+    parser.add_argument("--preload", nargs="*", default=[], help="modules to import as well as the defaults")
+    args = parser.parse_args(argv)
+    serve(args.socket, PRELOAD + args.preload)
+
+
+if __name__ == "__main__":
+    main()
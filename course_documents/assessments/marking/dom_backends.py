@@ -0,0 +1,115 @@
+"""Solver backends for the dominating set covering model.
+
+Every backend takes the model as marking.dom_kernel leaves it (the vertex
+indices that are variables, and the covering rows over them) with a time
+limit in ms, and optionally a hint (a cover to start the search from) and an
+upper bound on the objective.  The bound is applied by CP-SAT only, as the
+objective's domain.  pywraplp gives the MIP solvers no objective cutoff (and
+SCIP's limits/objectivestop stops at the first solution that good rather
+than cutting off worse ones), so they ignore it and get only the hint, which
+HiGHS cannot take either.  Neither adds a row, so the model size reported is
+the covering model's whether or not they are given.  A backend times its
+build and solve phases into stats, fills in the model size and outcome the
+same way, and returns the chosen indices, or None without a solution.  So
+whichever backend ran, run_ilp's result looks the same, and
+stats["backend"] says which it was.
+
+The MIP backends are the pywraplp solvers bundled with ortools; "CP-SAT" is
+the CP-SAT solver itself, each row a clause, with "CP-SAT/8" asking for 8
+search workers; plain "CP-SAT" uses CP_SAT_WORKERS, or one in a
+marking.driver worker.
+"""
+from functools import partial
+
+from marking.driver import solver_workers
+from marking.stats import cp_sat_stats, mip_stats, phase
+
+MIP_SOLVERS = ("SCIP", "CBC", "HIGHS", "SAT")
+# pywraplp's HiGHS interface crashes the process when given a hint
+MIP_HINTLESS = ("HIGHS",)
+# search threads unless told otherwise, or 1 in a marking.driver worker
+CP_SAT_WORKERS = 8
+
+
+# pywraplp covering model; returns {vertex index: variable} for the given
+# variables, which must include every row member
+def build_mip(solver, variables, rows):
+    x = {i: solver.BoolVar("x_%d" % i) for i in variables}
+    infinity = solver.infinity()
+    for row in rows:
+        constraint = solver.RowConstraint(1, infinity, "")
+        for i in row:
+            constraint.SetCoefficient(x[i], 1)
+    objective = solver.Objective()
+    for variable in x.values():
+        objective.SetCoefficient(variable, 1)
+    objective.SetMinimization()
+    return x
+
+
+# bound is accepted for the common signature and ignored (see above)
+def solve_mip(solver_id, variables, rows, time_limit, stats, hint=None, bound=None):
+    from ortools.linear_solver import pywraplp
+
+    solver = pywraplp.Solver.CreateSolver(solver_id)
+    if not solver:
+        raise ValueError("ortools has no " + solver_id + " solver here")
+    if time_limit is not None:
+        solver.SetTimeLimit(int(time_limit))
+    with phase(stats, "build_time"):
+        x = build_mip(solver, variables, rows)
+        if hint is not None and solver_id not in MIP_HINTLESS:
+            chosen = set(hint)
+            solver.SetHint(list(x.values()), [1.0 if i in chosen else 0.0 for i in x])
+    with phase(stats, "solve_time"):
+        status = solver.Solve()
+    mip_stats(stats, solver, status)
+    if status not in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE):
+        return None
+    return [i for i, variable in x.items() if variable.solution_value() > 0.5]
+
+
+def build_cp_sat(model, variables, rows):
+    x = {i: model.NewBoolVar("x_%d" % i) for i in variables}
+    for row in rows:
+        model.AddBoolOr([x[i] for i in row])
+    model.Minimize(sum(x.values()))
+    return x
+
+
+def solve_cp_sat(variables, rows, time_limit, stats, hint=None, bound=None, workers=None):
+    from ortools.sat.python import cp_model
+
+    model = cp_model.CpModel()
+    with phase(stats, "build_time"):
+        x = build_cp_sat(model, variables, rows)
+        if bound is not None:
+            model.Proto().objective.domain.extend([0, int(bound)])
+        if hint is not None:
+            chosen = set(hint)
+            for i, variable in x.items():
+                model.AddHint(variable, i in chosen)
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = workers or solver_workers(CP_SAT_WORKERS)
+    if time_limit is not None:
+        solver.parameters.max_time_in_seconds = time_limit / 1000
+    with phase(stats, "solve_time"):
+        status = solver.Solve(model)
+    cp_sat_stats(stats, model, solver, status)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None
+    return [i for i, variable in x.items() if solver.BooleanValue(variable)]
+
+
+BACKENDS = dict({solver_id: partial(solve_mip, solver_id) for solver_id in MIP_SOLVERS},
+                **{"CP-SAT": solve_cp_sat})
+
+
+# the backend function for a name in BACKENDS, or "CP-SAT/<workers>"
+def backend_for(name):
+    base, _, workers = name.partition("/")
+    if base not in BACKENDS or (workers and base != "CP-SAT"):
+        raise ValueError("unknown backend " + repr(name) + "; choose from " + ", ".join(BACKENDS))
+    if workers:
+        return partial(solve_cp_sat, workers=int(workers))
+    return BACKENDS[base]
@@ -0,0 +1,59 @@
+"""Lazy greedy heuristic for the dominating set covering model.
+
+Repeatedly takes the vertex that covers the most rows not yet covered.  Gains
+only ever go down, so they sit in a heap and a popped gain is recounted only
+when it might be stale: if it still beats everything below it, the vertex is
+taken without looking at the rest.  Each row is visited once per member when
+it gets covered, so the work is about the sum of the ball sizes times a log.
+A last pass drops chosen vertices whose rows are all covered by others.
+
+The result is always a valid cover, usually close to optimal on the assessed
+families; solve_dominating_set hands it to the solver as a hint and falls
+back on it when the solver has nothing better in time.
+"""
+import heapq
+
+
+# vertex indices covering every row, over the given variables (which must
+# include every row member)
+def greedy_cover(variables, rows):
+    columns = {v: [] for v in variables}
+    for r, row in enumerate(rows):
+        for v in row:
+            columns[v].append(r)
+    gain = {v: len(column) for v, column in columns.items()}
+    heap = [(-count, v) for v, count in gain.items() if count]
+    heapq.heapify(heap)
+    covered = bytearray(len(rows))
+    chosen = []
+    left = len(rows)
+    while left:
+        negative, v = heapq.heappop(heap)
+        if -negative != gain[v]:
+            if gain[v]:
+                heapq.heappush(heap, (-gain[v], v))
+            continue
+        chosen.append(v)
+        for r in columns[v]:
+            if not covered[r]:
+                covered[r] = 1
+                left -= 1
+                for u in rows[r]:
+                    gain[u] -= 1
+    return _prune(chosen, columns, len(rows))
+
+
+# drops chosen vertices, last taken first, while every row stays covered
+def _prune(chosen, columns, row_count):
+    cover_count = [0] * row_count
+    for v in chosen:
+        for r in columns[v]:
+            cover_count[r] += 1
+    kept = []
+    for v in reversed(chosen):
+        if all(cover_count[r] > 1 for r in columns[v]):
+            for r in columns[v]:
+                cover_count[r] -= 1
+        else:
+            kept.append(v)
+    return sorted(kept)
@@ -0,0 +1,232 @@
+"""Reference engine for the distance dominating set ILP.
+
+The model has a 0/1 variable per vertex and a covering row per vertex: some
+vertex within distance k of it must be chosen.  Each row is the vertex's
+k-ball, found by a breadth-first search that stops at depth k, so nothing
+like all_pairs_shortest_path_length is ever built.  The balls come from the
+graph's DominationOracle (marking.domination), for a connected graph the one
+oracle_for gives the validator too, and each component keeps its oracle
+across the distances of solve_dominating_sets, where a smaller k's ball is a
+prefix of a larger one's (so, as for oracle_for, a graph must not change
+once solved).  Two vertices with the same ball need only one row, so the
+rows kept take O(sum of the distinct ball sizes) memory.  The rows are then
+kernelized (marking.dom_kernel) and what is left goes to one of the solver
+backends in marking.dom_backends.  Disconnected graphs are solved a
+component at a time (marking.components).
+"""
+import math
+import multiprocessing
+import os
+import time
+from array import array
+
+from marking.components import centre_within, components
+from marking.dom_backends import backend_for
+from marking.dom_greedy import greedy_cover
+from marking.dom_kernel import Kernel, kernelize
+from marking.domination import DominationOracle, oracle_for
+from marking.driver import solver_workers
+from marking.stats import new_stats, phase
+
+
+# the distinct k-balls of the graph as sorted index arrays, in vertex order of
+# their first appearance; math.inf for k means every vertex's component.  The
+# balls come from oracle, a DominationOracle for graph, made if not given.
+def coverage_rows(graph, k, oracle=None):
+    oracle = oracle or DominationOracle(graph)
+    if k == math.inf:
+        k = oracle.graph.n
+    seen = set()
+    rows = []
+    for i in range(oracle.graph.n):
+        ball = array("i", sorted(oracle.ball_indices(i, k)))
+        key = ball.tobytes()
+        if key not in seen:
+            seen.add(key)
+            rows.append(ball)
+    return rows
+
+
+# (chosen labels, stats) for one connected graph; if the backend has no
+# solution by deadline (a time.time() value, or None for no limit) the best
+# cover known is used instead, with the status "GREEDY".  previous is a cover
+# of the graph's vertex indices for a smaller distance, so also one for k.
+def _solve_connected(graph, k, deadline, reduce, backend, previous=None, oracle=None):
+    stats = new_stats()
+    stats["backend"] = backend
+    with phase(stats, "preprocess_time"):
+        rows = coverage_rows(graph, k, oracle)
+        if reduce:
+            kernel = kernelize(graph, k, rows, deadline)
+            stats["reduction"] = kernel.reduction
+        else:
+            kernel = Kernel([], rows, range(graph.n), None)
+
+    chosen = list(kernel.forced)
+    if kernel.rows:
+        with phase(stats, "preprocess_time"):
+            incumbent = greedy_cover(kernel.variables, kernel.rows)
+            stats["greedy_size"] = len(kernel.forced) + len(incumbent)
+            if previous is not None:
+                # the reductions may have dropped some of previous's vertices,
+                # so what is left of it is only used if it still covers
+                variables = set(kernel.variables)
+                kept = {i for i in previous if i in variables}
+                if len(kept) < len(incumbent) and all(not kept.isdisjoint(row) for row in kernel.rows):
+                    incumbent = sorted(kept)
+        solved = None
+        time_limit = None
+        if deadline is not None:
+            time_limit = int((deadline - time.time()) * 1000)
+        if time_limit is None or time_limit > 0:
+            solved = backend_for(backend)(kernel.variables, kernel.rows, time_limit, stats, hint=incumbent,
+                                          bound=len(incumbent))
+        if solved is None or len(solved) > len(incumbent):
+            # out of time, or the solver's best is worse than the hint
+            if solved is None:
+                stats["status"] = "GREEDY"
+            stats["objective"] = len(incumbent)
+            solved = incumbent
+        chosen += solved
+        stats["objective"] += len(kernel.forced)
+        stats["best_bound"] = (stats["best_bound"] or 0) + len(kernel.forced)
+    else:
+        # the reductions settled every row, and they keep an optimum
+        stats.update(variables=0, constraints=0, nonzeros=0, status="OPTIMAL", objective=len(chosen),
+                     best_bound=len(chosen))
+    labels = graph.labels
+    return [labels[i] for i in chosen], stats
+
+
+def _solve_task(task):
+    return _solve_connected(*task)
+
+
+# the components' stats added up into stats; the status is the worst of
+# theirs, GREEDY being worse than FEASIBLE, and the reduction stopped if any
+# component's did
+def _merge_stats(stats, parts, closed_form):
+    stats["components"] = {"components": len(parts) + closed_form, "closed_form": closed_form,
+                           "solved": len(parts)}
+    stats["status"] = "OPTIMAL"
+    stats["objective"] = stats["best_bound"] = closed_form
+    # no model at all when every component had a closed form
+    for key in ("variables", "constraints", "nonzeros"):
+        stats[key] = stats[key] or 0
+    for part in parts:
+        for key in ("build_time", "solve_time", "variables", "constraints", "nonzeros"):
+            if part[key] is not None:
+                stats[key] = (stats[key] or 0) + part[key]
+        stats["preprocess_time"] = (stats["preprocess_time"] or 0.0) + part["preprocess_time"]
+        stats["objective"] += part["objective"]
+        stats["best_bound"] += part["best_bound"]
+        if part["status"] != "OPTIMAL" and stats["status"] != "GREEDY":
+            stats["status"] = part["status"]
+        if part.get("greedy_size") is not None:
+            stats["greedy_size"] = stats.get("greedy_size", closed_form) + part["greedy_size"]
+        if part.get("reduction"):
+            reduction = stats.setdefault("reduction", {})
+            for key, count in part["reduction"].items():
+                if key == "stopped":
+                    reduction[key] = bool(reduction.get(key) or count)
+                else:
+                    reduction[key] = reduction.get(key, 0) + count
+    return stats
+
+
+# the CSRGraph for graph and a DominationOracle per component; a connected
+# graph keeps the oracle oracle_for gives everyone else
+def _component_oracles(graph):
+    oracle = oracle_for(graph)
+    parts = components(oracle.graph)
+    if len(parts) == 1:
+        return oracle.graph, [oracle]
+    return oracle.graph, [DominationOracle(part) for part in parts]
+
+
+# the result for one distance over the graph's components (see
+# solve_dominating_set), given as their oracles; previous is the set of labels
+# chosen for a smaller distance, or None
+def _solve_parts(graph, oracles, k, timeout, stats, reduce, workers, backend, previous=None):
+    deadline = time.time() + timeout / 1000 if timeout is not None and timeout > 0 else None
+    from_previous = 0
+    with phase(stats, "preprocess_time"):
+        chosen = []
+        tasks = []
+        for oracle in oracles:
+            part = oracle.graph
+            seed = None
+            if previous is not None:
+                seed = [i for i, label in enumerate(part.labels) if label in previous]
+                if len(seed) == 1:
+                    # a nonempty component needs a vertex, so one is optimal
+                    chosen.append(part.labels[seed[0]])
+                    from_previous += 1
+                    continue
+            centre = centre_within(part, k)
+            if centre is not None:
+                chosen.append(part.labels[centre])
+            else:
+                tasks.append((part, k, deadline, reduce, backend, seed, oracle))
+    closed_form = len(chosen)
+
+    workers = min(workers or solver_workers(os.cpu_count() or 1), len(tasks))
+    if workers > 1:
+        with multiprocessing.get_context("fork").Pool(workers) as pool:
+            # a pooled component searches its balls afresh rather than
+            # pickling its oracle's cache
+            solved = pool.map(_solve_task, [task[:-1] for task in tasks])
+    else:
+        solved = [_solve_task(task) for task in tasks]
+    for part_chosen, _ in solved:
+        chosen += part_chosen
+    stats["backend"] = backend
+    _merge_stats(stats, [part_stats for (_, part_stats) in solved], closed_form)
+    stats["components"]["from_previous"] = from_previous
+    chosen = set(chosen)
+    return {"dom_set": [v for v in graph.labels if v in chosen], "stats": stats,
+            "optimal": stats["status"] == "OPTIMAL"}
+
+
+# run_ilp's result for graph (networkx or CSR) at distance k: {'dom_set':
+# labels, 'stats': stats, 'optimal': bool}.  The backend is a name from
+# marking.dom_backends; a component it has not solved by the end of timeout ms
+# gets a greedy cover (marking.dom_greedy), which is valid but makes
+# 'optimal' False.
+# Each connected component is solved on its own: one a single vertex reaches
+# within k steps needs just that vertex, and the rest share the time budget,
+# up to workers of them at once in forked processes (workers None means one
+# per CPU, or one in a marking.driver worker).  With reduce each model is
+# kernelized first (marking.dom_kernel) and stats["reduction"] adds up by how
+# much; stats["components"] counts the components of each kind.
+def solve_dominating_set(graph, k=1, timeout=1000, stats=None, reduce=True, workers=None, backend="SCIP"):
+    if k < 0:
+        raise ValueError("Distance must be non-negative")
+    backend_for(backend)    # an unknown name fails here rather than in a worker
+    stats = stats if stats is not None else new_stats()
+    with phase(stats, "preprocess_time"):
+        graph, oracles = _component_oracles(graph)
+    return _solve_parts(graph, oracles, k, timeout, stats, reduce, workers, backend)
+
+
+# {k: solve_dominating_set's result} for every k in distances, each k getting
+# timeout ms.  The graph is indexed and split into components once, and the
+# distances are solved in increasing order: a cover for one k is a cover for
+# any larger k, so it seeds the next solve as hint and upper bound (the bound
+# only counts with CP-SAT, see marking.dom_backends), and a component it covers
+# with one vertex is settled for good.
+def solve_dominating_sets(graph, distances, timeout=1000, reduce=True, workers=None, backend="SCIP"):
+    if any(k < 0 for k in distances):
+        raise ValueError("Distance must be non-negative")
+    backend_for(backend)
+    started = time.perf_counter()
+    graph, oracles = _component_oracles(graph)
+    index_time = time.perf_counter() - started
+    results = {}
+    previous = None
+    for k in sorted(set(distances)):
+        stats = new_stats()
+        stats["preprocess_time"] = index_time if previous is None else 0.0
+        results[k] = _solve_parts(graph, oracles, k, timeout, stats, reduce, workers, backend, previous)
+        previous = set(results[k]["dom_set"])
+    return results
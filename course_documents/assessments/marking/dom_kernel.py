@@ -0,0 +1,169 @@
+"""Safe reductions of the distance dominating set covering model.
+
+The model's rows are the distinct k-balls (marking.dom_ilp.coverage_rows) and
+its variables are the vertices.  Each of these keeps some optimal solution,
+so an optimum of what is left plus the forced vertices is an optimum of the
+original:
+
+- a row that contains another row is implied by it and is dropped;
+- a variable that appears only in rows where some other variable also
+  appears can be swapped for that one, so it is dropped;
+- a row left with a single variable forces that vertex into the set, and
+  every row it covers is dropped;
+- for k = 1 the neighbour of a leaf is forced up front (it covers everything
+  the leaf does), one end being taken of a component that is a single edge.
+
+The rules are applied until none of them changes anything.  Vertices stay as
+CSR indices throughout; the caller maps them back to labels.
+"""
+import time
+from array import array
+from collections import namedtuple
+
+from marking.csr import as_csr
+
+# forced: sorted vertex indices that are in the set whatever the rest is
+# rows: the remaining covering rows, as sorted index arrays
+# variables: sorted vertex indices that still appear in some row
+# reduction: counts of what each rule removed, and the sizes before and after
+Kernel = namedtuple("Kernel", ["forced", "rows", "variables", "reduction"])
+
+
+# vertex indices forced by the k = 1 leaf rule
+def leaf_supports(graph):
+    graph = as_csr(graph)
+    supports = set()
+    for v in range(graph.n):
+        neighbours = set(graph.adjacent(v))
+        neighbours.discard(v)
+        if len(neighbours) != 1:
+            continue
+        (p,) = neighbours
+        others = set(graph.adjacent(p))
+        others.discard(p)
+        if len(others) > 1 or p < v:
+            supports.add(p)
+    return supports
+
+
+# a stack that holds each item at most once (set.pop slows down badly on a
+# large set that has had most of its items popped)
+class _Worklist:
+    def __init__(self, items=()):
+        self.stack = list(items)
+        self.queued = set(self.stack)
+
+    def add(self, item):
+        if item not in self.queued:
+            self.queued.add(item)
+            self.stack.append(item)
+
+    def pop(self):
+        item = self.stack.pop()
+        self.queued.discard(item)
+        return item
+
+    def __bool__(self):
+        return bool(self.stack)
+
+
+# rows and columns of the model, with the rows that have shrunk and the
+# variables that have lost rows since they were last looked at; only those can
+# have become a contained row or a dominated variable
+class _Cover:
+    def __init__(self, rows):
+        self.rows = {r: set(row) for r, row in enumerate(rows)}
+        self.columns = {}
+        for r, members in self.rows.items():
+            for v in members:
+                self.columns.setdefault(v, set()).add(r)
+        self.dirty_rows = _Worklist(self.rows)
+        self.dirty_variables = _Worklist(self.columns)
+
+    def drop_row(self, r):
+        for u in self.rows.pop(r):
+            column = self.columns[u]
+            column.discard(r)
+            if column:
+                self.dirty_variables.add(u)
+            else:
+                del self.columns[u]
+
+    def drop_variable(self, v):
+        for r in self.columns.pop(v):
+            self.rows[r].discard(v)
+            self.dirty_rows.add(r)
+
+    # v is chosen, so every row it is in is satisfied
+    def force(self, v):
+        for r in list(self.columns.get(v, ())):
+            self.drop_row(r)
+
+    # any row containing r contains r's least shared vertex, so only that
+    # vertex's rows are looked at; returns how many rows were dropped
+    def drop_supersets_of(self, r):
+        members = self.rows[r]
+        pivot = min(members, key=lambda v: len(self.columns[v]))
+        dropped = 0
+        for s in list(self.columns[pivot]):
+            if s != r and len(self.rows[s]) >= len(members) and members <= self.rows[s]:
+                self.drop_row(s)
+                dropped += 1
+        return dropped
+
+    # a variable dominating v is in every row v is in, so it is one of the
+    # members of v's smallest row
+    def dominated(self, v):
+        rows_v = self.columns[v]
+        smallest = min(rows_v, key=lambda r: len(self.rows[r]))
+        return any(w != v and len(self.columns[w]) >= len(rows_v) and rows_v <= self.columns[w]
+                   for w in self.rows[smallest])
+
+
+# the kernel of the covering model with the given rows over graph's vertices;
+# k only decides whether the leaf rule applies.  Past deadline (a time.time()
+# value) the rules stop where they are, which still leaves an exact model,
+# and reduction["stopped"] is True.
+def kernelize(graph, k, rows, deadline=None):
+    graph = as_csr(graph)
+    reduction = {"rows_before": len(rows), "variables_before": graph.n, "leaf_forced": 0, "forced": 0,
+                 "rows_dominated": 0, "variables_dominated": 0, "stopped": False}
+    cover = _Cover(rows)
+    forced = set()
+    if k == 1:
+        forced = leaf_supports(graph)
+        reduction["leaf_forced"] = len(forced)
+        for v in forced:
+            cover.force(v)
+
+    # rows that shrank are settled (forced if down to one vertex, else checked
+    # for rows containing them) before any variable is checked, as forcing
+    # removes the most; until nothing has changed
+    steps = 0
+    while cover.dirty_rows or cover.dirty_variables:
+        steps += 1
+        if deadline is not None and steps % 256 == 0 and time.time() > deadline:
+            reduction["stopped"] = True
+            break
+        if cover.dirty_rows:
+            r = cover.dirty_rows.pop()
+            members = cover.rows.get(r)
+            if members is None:
+                continue
+            if len(members) == 1:
+                v = next(iter(members))
+                forced.add(v)
+                reduction["forced"] += 1
+                cover.force(v)
+            else:
+                reduction["rows_dominated"] += cover.drop_supersets_of(r)
+        else:
+            v = cover.dirty_variables.pop()
+            if v in cover.columns and cover.dominated(v):
+                cover.drop_variable(v)
+                reduction["variables_dominated"] += 1
+
+    kernel_rows = [array("i", sorted(members)) for members in cover.rows.values()]
+    reduction["rows_after"] = len(kernel_rows)
+    reduction["variables_after"] = len(cover.columns)
+    return Kernel(sorted(forced), kernel_rows, sorted(cover.columns), reduction)
@@ -0,0 +1,147 @@
+"""Distance-domination checks used by the dominating set markers.
+
+A check is one multi-source breadth-first search out of the whole candidate
+set, so it costs O(n + m) however large the set is.  Graphs may be networkx
+graphs or CSRGraphs; vertices are always reported by their original labels.
+"""
+import math
+import weakref
+from array import array
+from collections import OrderedDict, namedtuple
+
+from marking.csr import as_csr, bfs_layers
+
+# dominates: True iff every vertex is within distance k of the set
+# undominated: the vertices further than k from the set, in graph order
+# max_distance: the largest distance from any vertex to the set (math.inf if
+#   some vertex cannot reach the set, None if the search stopped at depth k)
+DominationResult = namedtuple("DominationResult", ["dominates", "undominated", "max_distance"])
+
+
+# with measure=False the search stops at depth k, which is all that is needed
+# for a true/false answer; with measure=True it carries on when the set fails
+# so that max_distance says how far off the candidate was
+def check_distance_domination(graph, dom_set, k, measure=True):
+    graph = as_csr(graph)
+    sources = [i for i in map(graph.index, dom_set) if i is not None]
+    dist = array("i", [-1]) * graph.n
+    reached = 0
+    for depth, layer in enumerate(bfs_layers(graph, sources)):
+        if depth > k and not measure:
+            break
+        for v in layer:
+            dist[v] = depth
+        reached += len(layer)
+
+    labels = graph.labels
+    undominated = [labels[v] for v in range(graph.n) if not 0 <= dist[v] <= k]
+    if reached == graph.n:
+        max_distance = max(dist, default=0)
+    elif measure:
+        max_distance = math.inf
+    else:
+        max_distance = None
+    return DominationResult(not undominated, undominated, max_distance)
+
+
+def distance_dominates(graph, dom_set, k):
+    return check_distance_domination(graph, dom_set, k, measure=False).dominates
+
+
+def is_dominating_set(graph, dom_set):
+    return distance_dominates(graph, dom_set, 1)
+
+
+# Answers ball and domination queries on one graph for any distance, so that a
+# harness trying several k, and the model builders it calls, search each
+# vertex's neighbourhood once.  Balls are kept breadth-first ordered, so the
+# ball for a smaller k is a prefix of the one stored for a larger k.  At most
+# max_stored vertex entries are kept over all balls (about 4 bytes each), the
+# least recently used balls being dropped first; max_sets candidate sets keep
+# their distance to the furthest vertex.  The graph must not change afterwards.
+class DominationOracle:
+    def __init__(self, graph, max_stored=10_000_000, max_sets=1024):
+        self.graph = as_csr(graph)
+        self.max_stored = max_stored
+        self.max_sets = max_sets
+        self.stored = 0
+        self._balls = OrderedDict()
+        self._set_distances = OrderedDict()
+
+    # vertex indices within distance k of vertex index i, nearest first
+    def ball_indices(self, i, k):
+        entry = self._balls.get(i)
+        if entry is None:
+            order, ends, complete = array("i", [i]), [1], False
+        else:
+            order, ends, complete = entry
+            if complete or k < len(ends):
+                self._balls.move_to_end(i)
+                return order[:ends[min(k, len(ends) - 1)]]
+            self._forget(i)
+
+        # carry the search on outwards from the outermost stored layer
+        offsets = self.graph.offsets
+        neighbours = self.graph.neighbours
+        seen = set(order)
+        layer = order[ends[-2] if len(ends) > 1 else 0:]
+        while len(ends) <= k:
+            next_layer = []
+            for u in layer:
+                for w in neighbours[offsets[u]:offsets[u + 1]]:
+                    if w not in seen:
+                        seen.add(w)
+                        next_layer.append(w)
+            if not next_layer:
+                complete = True
+                break
+            order.extend(next_layer)
+            ends.append(len(order))
+            layer = next_layer
+        self._remember(i, (order, ends, complete))
+        return order[:]
+
+    def ball(self, v, k):
+        i = self.graph.index(v)
+        if i is None:
+            raise KeyError(v)
+        labels = self.graph.labels
+        return [labels[j] for j in self.ball_indices(i, k)]
+
+    # largest distance from any vertex to dom_set (math.inf if some vertex
+    # cannot reach it); one search per distinct set, whatever k is asked about
+    def max_distance(self, dom_set):
+        key = frozenset(dom_set)
+        if key in self._set_distances:
+            self._set_distances.move_to_end(key)
+            return self._set_distances[key]
+        distance = check_distance_domination(self.graph, key, 0).max_distance
+        self._set_distances[key] = distance
+        if len(self._set_distances) > self.max_sets:
+            self._set_distances.popitem(last=False)
+        return distance
+
+    def dominates(self, dom_set, k):
+        return self.max_distance(dom_set) <= k
+
+    def _remember(self, i, entry):
+        self._balls[i] = entry
+        self.stored += len(entry[0])
+        while self.stored > self.max_stored and len(self._balls) > 1:
+            self._forget(next(iter(self._balls)))
+
+    def _forget(self, i):
+        order, _, _ = self._balls.pop(i)
+        self.stored -= len(order)
+
+
+_oracles = weakref.WeakKeyDictionary()
+
+
+# the oracle for graph, shared by everyone who asks about the same graph object
+def oracle_for(graph):
+    try:
+        return _oracles[graph]
+    except KeyError:
+        oracle = _oracles[graph] = DominationOracle(graph)
+        return oracle
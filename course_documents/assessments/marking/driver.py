@@ -0,0 +1,273 @@
+"""Run marking jobs in parallel worker processes with hard limits each.
+
+Every job runs in its own forked process, at most `workers` at a time, so a
+submission that hangs, crashes or leaks only loses its own job: when a job
+overruns its wall-clock limit its process is killed and the job is recorded
+as a timeout.  A worker can also be held to an address-space limit
+(RLIMIT_AS) and a CPU-time limit (RLIMIT_CPU).  Workers are reaped with
+wait4, so every job records its peak resident set size and CPU time, however
+it ended.  Each worker leads its own process group, and a kill takes the whole
+group, so processes a submission forks (a solver pool, say) die with it; a
+worker's environment sets MARKING_SOLVER_WORKERS=1, so solvers that would fork
+a process per CPU or run several search threads stay within the worker's
+core instead.  Results come back
+in job order and, if asked, are appended to a JSON lines file as each job
+finishes.
+"""
+import importlib.util
+import json
+import multiprocessing
+import os
+import resource
+import signal
+import sys
+import time
+import traceback
+from collections import namedtuple
+from multiprocessing.connection import wait
+
+OK = "ok"
+NO_RESULT = "no_result"   # run_ilp returned None
+TIMEOUT = "timeout"       # over the wall-clock or the CPU limit
+OOM = "oom"               # ran out of memory under the address-space limit
+CRASH = "crash"
+
+# read by solvers (through solver_workers) as their default process or search
+# thread count
+SOLVER_WORKERS_ENV = "MARKING_SOLVER_WORKERS"
+
+# ru_maxrss is in kilobytes, except on macOS where it is in bytes
+_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+# key: how the caller files the result, e.g. (instance_name, distance)
+# run: called with no arguments in the worker, returns a run_ilp style dict
+# check: called in the worker with that dict, returns (valid, size)
+# store_key: where the outcome is kept in a marking.store.ResultStore, if the
+#   job may be answered from one
+Job = namedtuple("Job", ["key", "run", "check", "store_key"], defaults=[None])
+
+# peak_rss is in bytes and cpu_time in seconds, user plus system; a forked
+# worker starts out sharing the marker's memory, which counts towards both
+# peak_rss and the address-space limit.  validate_time is the seconds the
+# check took, None if it did not run.
+JobResult = namedtuple("JobResult", ["key", "outcome", "valid", "size", "wall_time", "result", "error",
+                                     "peak_rss", "cpu_time", "validate_time"])
+
+
+class CpuLimitExceeded(Exception):
+    pass
+
+
+# submissions are loaded from their file in the worker, so a submission that
+# fails to import only fails its own jobs; its directory goes on sys.path so
+# it can import its own helpers
+def load_submission(path):
+    path = os.path.abspath(path)
+    name = "submission_" + str(abs(hash(path)))
+    if name in sys.modules:
+        return sys.modules[name]
+    sys.path.insert(0, os.path.dirname(path))
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    sys.modules[name] = module
+    return module
+
+
+# the processes or threads a solver not told otherwise should use: 1 in a
+# driver worker, else default
+def solver_workers(default):
+    return int(os.environ.get(SOLVER_WORKERS_ENV, 0)) or default
+
+
+def call_submission(path, function, *args, **kwargs):
+    return getattr(load_submission(path), function)(*args, **kwargs)
+
+
+def _raise_cpu_limit(signum, frame):
+    raise CpuLimitExceeded("over the CPU time limit")
+
+
+# the soft CPU limit raises CpuLimitExceeded in Python code; a submission stuck
+# in a solver's C code is killed by the hard limit a couple of seconds later
+def _set_limits(memory_limit, cpu_limit):
+    if memory_limit is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    if cpu_limit is not None:
+        seconds = max(1, int(cpu_limit))
+        signal.signal(signal.SIGXCPU, _raise_cpu_limit)
+        resource.setrlimit(resource.RLIMIT_CPU, (seconds, seconds + 2))
+
+
+def _work(job, conn, memory_limit, cpu_limit):
+    try:
+        _set_limits(memory_limit, cpu_limit)
+        result = job.run()
+        if result is None:
+            conn.send((NO_RESULT, False, None, None, None, None))
+        else:
+            started = time.perf_counter()
+            valid, size = job.check(result)
+            conn.send((OK, valid, size, result, None, time.perf_counter() - started))
+    except CpuLimitExceeded:
+        conn.send((TIMEOUT, False, None, None, "over the CPU limit of " + str(cpu_limit) + "s", None))
+    except MemoryError:
+        conn.send((OOM, False, None, None, "over the memory limit of " + str(memory_limit) + " bytes", None))
+    except BaseException:
+        conn.send((CRASH, False, None, None, traceback.format_exc(limit=-3), None))
+    finally:
+        conn.close()
+
+
+def _start(job, memory_limit, cpu_limit):
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            os.setpgid(0, 0)
+            os.environ[SOLVER_WORKERS_ENV] = "1"
+            receiver.close()
+            _work(job, sender, memory_limit, cpu_limit)
+            code = 0
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+    # set from both sides, so the group exists whichever runs first
+    try:
+        os.setpgid(pid, pid)
+    except OSError:
+        pass
+    sender.close()
+    return pid, receiver
+
+
+# kills the worker and anything it forked
+def _kill(pid):
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+# (exit code, peak_rss, cpu_time) of a finished or killed worker
+def _reap(pid):
+    _, status, usage = os.wait4(pid, 0)
+    return (os.waitstatus_to_exitcode(status), usage.ru_maxrss * _RSS_UNIT,
+            usage.ru_utime + usage.ru_stime)
+
+
+# a worker that died without sending anything was killed by the kernel: at its
+# soft or hard CPU limit, or (SIGKILL with CPU time to spare) by the OOM killer
+def _lost(exit_code, cpu_time, cpu_limit):
+    hard_limit_hit = cpu_limit is not None and cpu_time >= max(1, int(cpu_limit)) + 1
+    if exit_code == -signal.SIGXCPU or (exit_code == -signal.SIGKILL and hard_limit_hit):
+        return TIMEOUT, "over the CPU limit of " + str(cpu_limit) + "s"
+    if exit_code == -signal.SIGKILL:
+        return OOM, "killed by the kernel, most likely out of memory"
+    return CRASH, "worker exited without a result, exit code " + str(exit_code)
+
+
+def _record(results_file, result):
+    if results_file is None:
+        return
+    row = {"key": result.key, "outcome": result.outcome, "valid": result.valid,
+           "size": result.size, "wall_time": result.wall_time, "peak_rss": result.peak_rss,
+           "cpu_time": result.cpu_time, "validate_time": result.validate_time, "error": result.error}
+    results_file.write(json.dumps(row, default=str) + "\n")
+    results_file.flush()
+
+
+# whether a finished job's outcome depends on the submission alone, so a store
+# may keep it: an OK result proven optimal, or with no stats to say otherwise.
+# Crashes, timeouts and kills for memory can follow from the machine's load,
+# and so can no result (NO_RESULT is a solver out of time) or a FEASIBLE or
+# GREEDY incumbent cut off by its time limit.
+def is_settled(result):
+    if result.outcome != OK:
+        return False
+    stats = result.result.get("stats") if isinstance(result.result, dict) else None
+    return stats is None or (isinstance(stats, dict) and stats.get("status") == "OPTIMAL")
+
+
+def _finish(results, index, result, jobs, results_file, store):
+    results[index] = result
+    _record(results_file, result)
+    if store is not None and jobs[index].store_key is not None and is_settled(result):
+        store.put(jobs[index].store_key, result)
+
+
+# timeout is the wall-clock limit per job in seconds; memory_limit (bytes of
+# address space) and cpu_limit (seconds) are only applied if given;
+# results_path, if given, gets one JSON object per job appended as the job
+# finishes.  With a store, jobs whose store_key it already holds are answered
+# from it without running, and each other job's outcome, if is_settled, is
+# saved to it as the job finishes.
+def run_jobs(jobs, workers=None, timeout=60.0, results_path=None, memory_limit=None, cpu_limit=None,
+             store=None):
+    workers = workers or os.cpu_count() or 1
+    results = [None] * len(jobs)
+    pending = []
+    running = {}
+    results_file = open(results_path, "a") if results_path is not None else None
+    for index in reversed(range(len(jobs))):
+        stored = None
+        if store is not None and jobs[index].store_key is not None:
+            stored = store.get(jobs[index].store_key)
+        if stored is None:
+            pending.append(index)
+        else:
+            results[index] = JobResult(key=jobs[index].key, **stored)
+            _record(results_file, results[index])
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                index = pending.pop()
+                pid, receiver = _start(jobs[index], memory_limit, cpu_limit)
+                running[receiver] = (index, pid, time.monotonic())
+
+            now = time.monotonic()
+            next_deadline = min(started + timeout for (_, _, started) in running.values())
+            for receiver in wait(list(running), timeout=max(0.0, next_deadline - now)):
+                index, pid, started = running.pop(receiver)
+                try:
+                    message = receiver.recv()
+                except EOFError:
+                    message = None
+                receiver.close()
+                exit_code, peak_rss, cpu_time = _reap(pid)
+                if message is None:
+                    outcome, error = _lost(exit_code, cpu_time, cpu_limit)
+                    valid, size, result, validate_time = False, None, None, None
+                else:
+                    outcome, valid, size, result, error, validate_time = message
+                result = JobResult(jobs[index].key, outcome, valid, size, time.monotonic() - started,
+                                   result, error, peak_rss, cpu_time, validate_time)
+                _finish(results, index, result, jobs, results_file, store)
+
+            now = time.monotonic()
+            for receiver, (index, pid, started) in list(running.items()):
+                if now - started >= timeout:
+                    _kill(pid)
+                    _, peak_rss, cpu_time = _reap(pid)
+                    receiver.close()
+                    del running[receiver]
+                    result = JobResult(jobs[index].key, TIMEOUT, False, None, now - started, None,
+                                       "killed after " + str(timeout) + "s", peak_rss, cpu_time, None)
+                    _finish(results, index, result, jobs, results_file, store)
+    finally:
+        for receiver, (_, pid, _) in running.items():
+            _kill(pid)
+            os.waitpid(pid, 0)
+            receiver.close()
+        if results_file is not None:
+            results_file.close()
+    return results
+
+
+# the harnesses' {key: (valid, size)} shape
+def results_table(results):
+    return {result.key: (result.valid, result.size) for result in results}
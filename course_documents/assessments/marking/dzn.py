@@ -0,0 +1,51 @@
+"""Reader for the .dzn instance files used by the markers.
+
+The whole file is tokenized in one pass, so arrays may span any number of
+lines, and integer arrays come back as compact array('i') buffers (int32)
+rather than lists of Python ints.  Use numpy.frombuffer(values["from"],
+dtype=numpy.int32) if a NumPy view is wanted; it does not copy.
+"""
+import re
+from array import array
+
+_COMMENT = re.compile(rb"%[^\n]*")
+_ASSIGNMENT = re.compile(rb"([A-Za-z][A-Za-z0-9_]*)\s*=\s*([^;]*);")
+
+
+# integer scalars become ints, anything in [...] becomes an array('i') of its
+# entries (so array1d(1..m, [...]) works too), any other value is kept as text;
+# assignment is the pattern for one `name = value` (see marking.mzn_output)
+def parse_dzn(data, assignment=_ASSIGNMENT):
+    if isinstance(data, str):
+        data = data.encode()
+    if b"%" in data:
+        data = _COMMENT.sub(b"", data)
+    values = {}
+    for match in assignment.finditer(data):
+        name = match.group(1).decode()
+        value = match.group(2)
+        start = value.find(b"[")
+        if start == -1:
+            try:
+                values[name] = int(value)
+            except ValueError:
+                values[name] = value.strip().decode()
+            continue
+        body = value[start + 1:value.rindex(b"]")].strip().rstrip(b",")
+        values[name] = array("i", map(int, body.split(b","))) if body else array("i")
+    return values
+
+
+def read_dzn(filename):
+    with open(filename, "rb") as dzn_file:
+        return parse_dzn(dzn_file.read())
+
+
+# vertices are 1..n as in the .dzn, including any isolated ones; networkx is
+# only imported here so the castle marker can read instances without it
+def to_networkx(values):
+    import networkx as nx
+    graph = nx.Graph()
+    graph.add_nodes_from(range(1, values["n"] + 1))
+    graph.add_edges_from(zip(values["from"], values["to"]))
+    return graph
@@ -0,0 +1,133 @@
+"""Directory mode for the .dzn dominating set markers.
+
+Marks every submission's output for every instance in one process: each
+instance .dzn is parsed once, and all the outputs for it are checked together
+with marking.batch, one walk of the graph per distance step however many
+submissions there are.  Each subdirectory of the submissions directory is one
+submission (files directly inside it form the submission "."), and its output
+for instance.dzn is the file named instance.txt, or instance with any other
+extension but .mzn/.dzn.  A row is written for every (submission, instance)
+pair, including outputs that are missing or hold no solution.
+"""
+import argparse
+import csv
+import multiprocessing
+import os
+import sys
+
+from marking.batch import validate_dominating_sets
+from marking.csr import CSRGraph
+from marking.dzn import read_dzn
+from marking.mzn_output import last_solution
+
+COLUMNS = ["submission", "instance", "distance", "valid", "size", "output", "error"]
+
+
+def instance_files(directory):
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".dzn"))
+
+
+# {submission name: directory}
+def submission_dirs(directory):
+    submissions = {}
+    names = sorted(os.listdir(directory))
+    if any(os.path.isfile(os.path.join(directory, name)) for name in names):
+        submissions["."] = directory
+    for name in names:
+        if os.path.isdir(os.path.join(directory, name)):
+            submissions[name] = os.path.join(directory, name)
+    return submissions
+
+
+def output_file(submission_dir, stem):
+    preferred = os.path.join(submission_dir, stem + ".txt")
+    if os.path.isfile(preferred):
+        return preferred
+    for name in sorted(os.listdir(submission_dir)):
+        root, extension = os.path.splitext(name)
+        if root == stem and extension not in (".mzn", ".dzn"):
+            return os.path.join(submission_dir, name)
+    return None
+
+
+# the last solution's 0/1 decision array, as the single-file markers read it
+def read_decision(filename):
+    solution = last_solution(filename)
+    if solution is not None:
+        return solution.get("decision")
+
+
+# rows for one instance; distance None means the instance's own k (1 if it
+# has none)
+def mark_instance(instance_path, submissions, distance=None):
+    values = read_dzn(instance_path)
+    graph = CSRGraph.from_dzn(values)
+    k = distance if distance is not None else values.get("k", 1)
+    stem = os.path.splitext(os.path.basename(instance_path))[0]
+    rows = []
+    candidates = []
+    for name, submission_dir in submissions.items():
+        row = {"submission": name, "instance": stem, "distance": k, "valid": "false", "size": None,
+               "output": output_file(submission_dir, stem), "error": None}
+        rows.append(row)
+        if row["output"] is None:
+            row["error"] = "no output file"
+            continue
+        try:
+            decision = read_decision(row["output"])
+        except (OSError, ValueError) as exception:
+            row["error"] = repr(exception)
+            continue
+        if decision is None or isinstance(decision, (int, str)):
+            row["error"] = "no decision array in the output"
+            continue
+        row["size"] = sum(decision)
+        candidates.append((row, [i + 1 for i in range(len(decision)) if decision[i] == 1]))
+    if candidates:
+        verdicts = validate_dominating_sets(graph, [chosen for (_, chosen) in candidates], k)
+        for (row, _), valid in zip(candidates, verdicts.valid):
+            row["valid"] = "true" if valid else "false"
+    return rows
+
+
+def _mark_one(arguments):
+    return mark_instance(*arguments)
+
+
+# one process per instance at a time when workers > 1; rows come back in
+# instance order, then submission order
+def mark_directory(instances_dir, submissions_dir, distance=None, workers=1):
+    submissions = submission_dirs(submissions_dir)
+    tasks = [(path, submissions, distance) for path in instance_files(instances_dir)]
+    if workers > 1 and len(tasks) > 1:
+        with multiprocessing.get_context("fork").Pool(workers) as pool:
+            per_instance = pool.map(_mark_one, tasks)
+    else:
+        per_instance = [mark_instance(*task) for task in tasks]
+    return [row for rows in per_instance for row in rows]
+
+
+def write_rows(rows, out):
+    writer = csv.DictWriter(out, fieldnames=COLUMNS)
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+# argv as in `script.py --batch INSTANCES SUBMISSIONS [--csv FILE] [--workers N]`;
+# distance fixes k for every instance (the assign-0 marker's 1), otherwise the
+# assign-1 marker's --distance option does, or else each instance's own k
+def main(argv, distance=None):
+    parser = argparse.ArgumentParser(prog=os.path.basename(argv[0]) + " --batch")
+    parser.add_argument("instances")
+    parser.add_argument("submissions")
+    parser.add_argument("--csv", help="file for the rows; standard output if not given")
+    parser.add_argument("--workers", type=int, default=1)
+    if distance is None:
+        parser.add_argument("--distance", type=int, help="k for every instance, instead of each one's own k")
+    args = parser.parse_args(argv[2:])
+    rows = mark_directory(args.instances, args.submissions, getattr(args, "distance", distance), args.workers)
+    if args.csv:
+        with open(args.csv, "w", newline="") as out:
+            write_rows(rows, out)
+    else:
+        write_rows(rows, sys.stdout)
@@ -0,0 +1,41 @@
+"""Content fingerprints used to key the markers' caches.
+
+Each is a SHA-256 hex digest, so equal digests mean equal content however the
+file was reached or the graph was built.
+"""
+import hashlib
+import json
+import os
+
+MARKING = os.path.dirname(os.path.abspath(__file__))
+
+
+def file_hash(path):
+    with open(path, "rb") as source:
+        return hashlib.sha256(source.read()).hexdigest()
+
+
+# changes whenever the vertices, the edges or the order they come in changes,
+# since relabelling a graph for a model follows that order
+def graph_fingerprint(graph):
+    digest = hashlib.sha256()
+    digest.update(repr(list(graph.nodes())).encode())
+    digest.update(repr(list(graph.edges())).encode())
+    return digest.hexdigest()
+
+
+# for JSON-like data: dicts in any key order, array('i') buffers as lists
+def data_fingerprint(data):
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=list).encode()).hexdigest()
+
+
+# changes with any module of the marking package (its tests aside) or any of
+# the other files given, such as the harness that defines a job's check
+def code_hash(paths=()):
+    modules = sorted(name for name in os.listdir(MARKING) if name.endswith(".py") and not name.startswith("test_"))
+    digest = hashlib.sha256()
+    for path in [os.path.join(MARKING, name) for name in modules] + [os.path.abspath(path) for path in paths]:
+        digest.update(os.path.basename(path).encode() + b"\0")
+        with open(path, "rb") as source:
+            digest.update(hashlib.sha256(source.read()).digest())
+    return digest.hexdigest()
@@ -0,0 +1,55 @@
+"""Vectorised interval checks for the castle visits marker.
+
+Guest g (numbered from 1 as in the .dzn) is at the castle from start[g - 1]
+to end[g - 1].  Every check compares all the guests or all the listed pairs
+in one numpy expression and returns every offender, not just the first.
+"""
+import numpy as np
+
+
+def _as_array(values):
+    return np.asarray(values, dtype=np.int64).reshape(-1)
+
+
+# guest numbers whose interval does not end after it starts
+def invalid_intervals(start, end):
+    start = _as_array(start)
+    end = _as_array(end)
+    count = min(len(start), len(end))
+    return np.flatnonzero(start[:count] >= end[:count]) + 1
+
+
+# the values that occur more than once, found from one sort
+def repeated_values(values):
+    ordered = np.sort(_as_array(values))
+    return np.unique(ordered[1:][ordered[1:] == ordered[:-1]])
+
+
+# overlap[p] says whether guests first[p] and second[p] are there together,
+# the same test as the marker's check_overlap; a guest with no interval
+# overlaps nobody
+def overlaps(start, end, first, second):
+    start = _as_array(start)
+    end = _as_array(end)
+    count = min(len(start), len(end))
+    i = _as_array(first) - 1
+    j = _as_array(second) - 1
+    known = (i >= 0) & (i < count) & (j >= 0) & (j < count)
+    i = np.where(known, i, 0)
+    j = np.where(known, j, 0)
+    if count == 0:
+        return np.zeros(len(i), dtype=bool)
+    si, ei, sj, ej = start[i], end[i], start[j], end[j]
+    return known & (((si <= sj) & (sj < ei)) | ((sj <= si) & (si < ej)))
+
+
+# (first, second) pairs, as guest numbers, that ought to meet but do not
+def missed_meetings(start, end, first, second):
+    missed = ~overlaps(start, end, first, second)
+    return list(zip(_as_array(first)[missed].tolist(), _as_array(second)[missed].tolist()))
+
+
+# (first, second) pairs, as guest numbers, that ought not to meet but do
+def unwanted_meetings(start, end, first, second):
+    met = overlaps(start, end, first, second)
+    return list(zip(_as_array(first)[met].tolist(), _as_array(second)[met].tolist()))
@@ -0,0 +1,123 @@
+"""Run many minizinc instances at once with minizinc-python's asyncio API.
+
+Each run asks minizinc for intermediate solutions and keeps the latest one,
+so a run that is stopped at its time limit still reports the best solution it
+had found.  minizinc is given the time limit itself; if it has not stopped
+GRACE seconds after that the run is cancelled, which kills the process.
+
+Models and solvers come from marking.mzn_cache.  Given a flat_dir, a run is
+flattened once into that directory and the minizinc process solves the kept
+FlatZinc directly, so re-running the same model on the same data skips the
+compiler.
+"""
+import asyncio
+import json
+import time
+from collections import namedtuple
+from datetime import timedelta
+
+import minizinc
+from minizinc import Instance, Status
+
+from marking.mzn_cache import flat_files, flat_key, model_for, solver_for
+
+GRACE = 5.0
+
+# key: how the caller files the run; model: path to the .mzn file;
+# data: {parameter name: value} assigned to the instance
+MznRun = namedtuple("MznRun", ["key", "model", "data"])
+
+# status: name of minizinc's final status, e.g. "OPTIMAL_SOLUTION"
+# result: the minizinc Result holding the best solution seen, or for a run
+#   from kept FlatZinc a dict of that solution's output values; None if none
+# cut_off: the run stopped at its time limit rather than finishing the search
+MznOutcome = namedtuple("MznOutcome", ["key", "status", "result", "cut_off", "wall_time", "error"])
+
+_FINISHED = (Status.OPTIMAL_SOLUTION, Status.ALL_SOLUTIONS, Status.UNSATISFIABLE, Status.UNBOUNDED)
+
+
+# the solution lines of minizinc's --json-stream output can be long
+_LINE_LIMIT = 1 << 26
+
+
+async def _flat_solutions(solver, fzn, ozn, time_limit):
+    if minizinc.default_driver is None:
+        raise RuntimeError("no minizinc executable found")
+    with solver.configuration() as configuration:
+        process = await asyncio.create_subprocess_exec(
+            str(minizinc.default_driver.executable), "--solver", configuration, "--json-stream",
+            "--intermediate-solutions", "--time-limit", str(max(1, int(time_limit * 1000))),
+            "--ozn-file", ozn, fzn,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL, limit=_LINE_LIMIT)
+        try:
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                message = json.loads(line)
+                if message["type"] == "error":
+                    raise RuntimeError(message.get("message", "minizinc error"))
+                if message["type"] in ("solution", "status"):
+                    yield message
+            await process.wait()
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
+
+async def solve_run(run, solver="gecode", time_limit=60.0, semaphore=None, flat_dir=None):
+    semaphore = semaphore or asyncio.Semaphore(1)
+    async with semaphore:
+        started = time.monotonic()
+        best = None
+        status = Status.UNKNOWN
+        error = None
+        cancelled = False
+
+        async def follow(instance):
+            nonlocal best, status
+            async for result in instance.solutions(time_limit=timedelta(seconds=time_limit),
+                                                   intermediate_solutions=True):
+                status = result.status
+                if result.solution is not None:
+                    best = result
+
+        async def follow_flat(instance):
+            nonlocal best, status
+            fzn, ozn = await asyncio.to_thread(flat_files, instance, flat_dir,
+                                               flat_key(run.model, run.data, solver))
+            remaining = time_limit - (time.monotonic() - started)
+            async for message in _flat_solutions(solver_for(solver), fzn, ozn, remaining):
+                if message["type"] == "status":
+                    status = Status.from_str(message["status"])
+                else:
+                    best = message["output"]["json"]
+                    if status == Status.UNKNOWN:
+                        status = Status.SATISFIED
+
+        try:
+            instance = Instance(solver_for(solver), model_for(run.model))
+            for name, value in run.data.items():
+                instance[name] = value
+            run_instance = follow if flat_dir is None else follow_flat
+            await asyncio.wait_for(run_instance(instance), time_limit + GRACE)
+        except asyncio.TimeoutError:
+            cancelled = True
+        except Exception as exception:
+            error = repr(exception)
+        cut_off = error is None and (cancelled or status not in _FINISHED)
+        return MznOutcome(run.key, status.name, best, cut_off, time.monotonic() - started, error)
+
+
+# at most concurrency minizinc processes run at a time; outcomes come back in
+# the order of runs
+async def solve_runs(runs, solver="gecode", concurrency=4, time_limit=60.0, flat_dir=None):
+    semaphore = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(*(solve_run(run, solver, time_limit, semaphore, flat_dir) for run in runs))
+
+
+def solve_all(runs, solver="gecode", concurrency=4, time_limit=60.0, flat_dir=None):
+    return asyncio.run(solve_runs(runs, solver, concurrency, time_limit, flat_dir))
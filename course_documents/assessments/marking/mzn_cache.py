@@ -0,0 +1,92 @@
+"""Caches that let repeated minizinc runs skip work that has already been done.
+
+Parsed models and solver configurations are kept per file content hash, so all
+the runs of one .mzn share a single Model, and with it the one analysis call
+minizinc-python makes to learn a model's output type.  The relabelled
+edge-list data for a graph is kept per graph fingerprint.  The FlatZinc
+compiled for a (model, data, solver) triple can be kept on disk, so a re-mark
+solves it again without flattening.  FlatZinc is compiled against one solver's
+library of global constraints, so a different solver gets its own files.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from minizinc import Model, Solver
+
+from marking.fingerprint import data_fingerprint, file_hash, graph_fingerprint
+
+_models = {}
+_solvers = {}
+_graph_data = {}
+
+
+# one Model per distinct file content, however many paths it is reached by
+def model_for(path):
+    key = file_hash(path)
+    if key not in _models:
+        _models[key] = Model(path)
+    return _models[key]
+
+
+# solver is a tag or id such as "gecode", or the path of a .msc file
+def solver_for(solver):
+    if os.path.isfile(solver):
+        key = ("file", file_hash(solver))
+        if key not in _solvers:
+            _solvers[key] = Solver.load(Path(solver))
+    else:
+        key = ("tag", solver)
+        if key not in _solvers:
+            _solvers[key] = Solver.lookup(solver)
+    return _solvers[key]
+
+
+# ({"n", "m", "from", "to"}, nodes_list) for the edge-list models, where the
+# model's vertex i + 1 is nodes_list[i]; the data is shared between callers,
+# so treat it as read-only
+def edge_list_data(graph):
+    key = graph_fingerprint(graph)
+    if key not in _graph_data:
+        nodes_list = list(graph.nodes())
+        name_dict = {node: index + 1 for (index, node) in enumerate(nodes_list)}
+        edges = list(graph.edges())
+        data = {"n": len(nodes_list), "m": len(edges),
+                "from": [name_dict[v] for (_, v) in edges],
+                "to": [name_dict[u] for (u, _) in edges]}
+        _graph_data[key] = (data, nodes_list)
+    return _graph_data[key]
+
+
+def flat_key(model_path, data, solver):
+    digest = hashlib.sha256()
+    for part in (file_hash(model_path), data_fingerprint(data), solver):
+        digest.update(part.encode() + b"\0")
+    return digest.hexdigest()
+
+
+# (fzn, ozn) paths in directory for instance, compiling them only if they are
+# not there yet; the output model prints every solution as JSON.  Files are
+# written under a temporary name and renamed, so concurrent runs of the same
+# key never see half a file.
+def flat_files(instance, directory, key):
+    fzn = os.path.join(directory, key + ".fzn")
+    ozn = os.path.join(directory, key + ".ozn")
+    if os.path.exists(fzn) and os.path.exists(ozn):
+        return fzn, ozn
+    os.makedirs(directory, exist_ok=True)
+    with instance.flat(**{"output-mode": "json"}) as (flat_fzn, flat_ozn, _):
+        for (source, target) in ((flat_fzn.name, fzn), (flat_ozn.name, ozn)):
+            handle, partial = tempfile.mkstemp(dir=directory, suffix=".part")
+            os.close(handle)
+            shutil.copyfile(source, partial)
+            os.replace(partial, target)
+    return fzn, ozn
+
+
+def clear_caches():
+    _models.clear()
+    _solvers.clear()
+    _graph_data.clear()
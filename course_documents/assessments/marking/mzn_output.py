@@ -0,0 +1,120 @@
+"""Incremental reader for the output of a minizinc run.
+
+minizinc prints each solution as `name = value;` lines closed by a line of
+dashes, possibly many of them when it reports intermediate solutions, and
+finishes with a status line such as ========== or =====UNSATISFIABLE=====.
+SolutionStream reads that output a line at a time from a file name, an open
+file or pipe (sys.stdin included) or an mmap, parsing one solution at a time
+with the .dzn parser, so the whole output is never held in memory.
+
+Output items are free text, so a solution is read more loosely than a .dzn:
+an assignment may end at the end of its line (or at the dashes) instead of a
+semicolon, as `output ["decision = ", show(decision)];` prints it, and names
+may hold hyphens, as in `Cape-Breton = 2;`.  A last block with no dashes
+after it still counts as a solution if it is nothing but whole assignments,
+as when output without any dashes is marked; one cut off part way through is
+ignored.
+"""
+import os
+import re
+
+from marking.dzn import _COMMENT, parse_dzn
+
+SOLUTION_END = b"----------"
+# a value runs to a semicolon or the end of the line, except inside [...]
+_OUTPUT_ASSIGNMENT = re.compile(rb"([A-Za-z][A-Za-z0-9_-]*)[ \t]*=[ \t]*((?:[^;\n\[]|\[[^\]]*\])*);?")
+
+# ========== means the search finished: the last solution is optimal for an
+# optimisation model, and all solutions have been printed for -a runs
+OPTIMAL = "OPTIMAL"
+UNSATISFIABLE = "UNSATISFIABLE"
+UNSAT_OR_UNBOUNDED = "UNSAT_OR_UNBOUNDED"
+UNBOUNDED = "UNBOUNDED"
+UNKNOWN = "UNKNOWN"
+ERROR = "ERROR"
+# the output stopped with at least one solution but no status line, as when
+# minizinc is killed by a timeout
+SATISFIED = "SATISFIED"
+
+STATUS_LINES = {
+    b"==========": OPTIMAL,
+    b"=====UNSATISFIABLE=====": UNSATISFIABLE,
+    b"=====UNSATorUNBOUNDED=====": UNSAT_OR_UNBOUNDED,
+    b"=====UNBOUNDED=====": UNBOUNDED,
+    b"=====UNKNOWN=====": UNKNOWN,
+    b"=====ERROR=====": ERROR,
+}
+
+
+def _lines(source):
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as output_file:
+            yield from output_file
+        return
+    source = getattr(source, "buffer", source)
+    while True:
+        line = source.readline()
+        if not line:
+            return
+        yield line if isinstance(line, bytes) else line.encode()
+
+
+# the solution in a block with no dashes after it, if the block is nothing but
+# whole assignments; a block cut off part way through is None
+def _complete_solution(data):
+    data = _COMMENT.sub(b"", data)
+    if not data.strip() or _OUTPUT_ASSIGNMENT.sub(b"", data).strip(b" \t\r\n;"):
+        return None
+    return parse_dzn(data, _OUTPUT_ASSIGNMENT)
+
+
+# Iterating gives each solution in turn as a dict like read_dzn's (int arrays
+# as array('i')).  status is None until the output has been read to the end.
+class SolutionStream:
+    def __init__(self, source):
+        self.source = source
+        self.status = None
+        self.count = 0
+
+    def __iter__(self):
+        block = []
+        for line in _lines(self.source):
+            stripped = line.strip()
+            if stripped.endswith(SOLUTION_END):
+                # output with no final newline runs into the dashes
+                if stripped != SOLUTION_END:
+                    block.append(stripped[:-len(SOLUTION_END)] + b"\n")
+                self.count += 1
+                yield parse_dzn(b"".join(block), _OUTPUT_ASSIGNMENT)
+                block = []
+            elif stripped.startswith(b"=====") and stripped in STATUS_LINES:
+                self.status = STATUS_LINES[stripped]
+            else:
+                block.append(line)
+        # output with no dashes after its last solution, or none at all
+        solution = _complete_solution(b"".join(block))
+        if solution is not None:
+            self.count += 1
+            yield solution
+        if self.status is None:
+            self.status = SATISFIED if self.count else UNKNOWN
+
+    # the final solution (the best one for an optimisation run), or None
+    def last(self):
+        solution = None
+        for solution in self:
+            pass
+        return solution
+
+    def is_unsatisfiable(self):
+        if self.status is None:
+            self.last()
+        return self.status in (UNSATISFIABLE, UNSAT_OR_UNBOUNDED)
+
+
+def read_solutions(source):
+    return SolutionStream(source)
+
+
+def last_solution(source):
+    return SolutionStream(source).last()
@@ -0,0 +1,125 @@
+"""The standard `stats` sub-dict of a run_ilp result, and its per-instance summary.
+
+A reference run_ilp times its phases into the dict with `phase` and fills in
+the model size and solver outcome with `mip_stats` or `cp_sat_stats`; the
+driver times the check of the result, which instance_stats puts in as
+validate_time.  A phase that happens several times in one run (each probe of
+a search over the horizon, say) adds up.  Any key a submission does not fill
+in stays None.
+"""
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+STATS_KEYS = ("preprocess_time", "build_time", "variables", "constraints", "nonzeros", "solve_time",
+              "status", "objective", "best_bound", "validate_time")
+TIME_KEYS = ("preprocess_time", "build_time", "solve_time", "validate_time")
+SIZE_KEYS = ("variables", "constraints", "nonzeros")
+
+
+def new_stats():
+    return dict.fromkeys(STATS_KEYS)
+
+
+@contextmanager
+def phase(stats, key):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats[key] = (stats[key] or 0.0) + time.perf_counter() - started
+
+
+def _mip_status_names():
+    from ortools.linear_solver import pywraplp
+    return {getattr(pywraplp.Solver, name): name
+            for name in ("OPTIMAL", "FEASIBLE", "INFEASIBLE", "UNBOUNDED", "ABNORMAL", "MODEL_INVALID",
+                         "NOT_SOLVED")}
+
+
+# model size and outcome of a solved pywraplp model; objective and bound are
+# only read when the solver has a solution
+def mip_stats(stats, solver, status):
+    from ortools.linear_solver import linear_solver_pb2
+    proto = linear_solver_pb2.MPModelProto()
+    solver.ExportModelToProto(proto)
+    stats["variables"] = solver.NumVariables()
+    stats["constraints"] = solver.NumConstraints()
+    stats["nonzeros"] = sum(len(constraint.var_index) for constraint in proto.constraint)
+    stats["status"] = _mip_status_names().get(status, str(status))
+    if stats["status"] in ("OPTIMAL", "FEASIBLE"):
+        stats["objective"] = solver.Objective().Value()
+        stats["best_bound"] = solver.Objective().BestBound()
+    return stats
+
+
+def _has(constraint, field):
+    has = getattr(constraint, "has_" + field, None)
+    return has() if has is not None else constraint.HasField(field)
+
+
+# counts a linear constraint's terms and a boolean constraint's literals, plus
+# any enforcement literals
+def cp_sat_size(model):
+    proto = model.Proto()
+    nonzeros = 0
+    for constraint in proto.constraints:
+        nonzeros += len(constraint.enforcement_literal)
+        if _has(constraint, "linear"):
+            nonzeros += len(constraint.linear.vars)
+        for field in ("bool_or", "bool_and", "at_most_one", "exactly_one"):
+            if _has(constraint, field):
+                nonzeros += len(getattr(constraint, field).literals)
+    return len(proto.variables), len(proto.constraints), nonzeros
+
+
+def cp_sat_stats(stats, model, solver, status):
+    stats["variables"], stats["constraints"], stats["nonzeros"] = cp_sat_size(model)
+    stats["status"] = solver.StatusName(status)
+    if stats["status"] in ("OPTIMAL", "FEASIBLE") and model.Proto().objective.vars:
+        stats["objective"] = solver.ObjectiveValue()
+        stats["best_bound"] = solver.BestObjectiveBound()
+    return stats
+
+
+# phase times add up over the runs, model sizes are the largest seen, and
+# statuses are counted; runs whose result has no stats are counted but
+# contribute nothing else
+def summarise(stats_list):
+    summary = {"runs": 0, "statuses": Counter()}
+    summary.update(dict.fromkeys(TIME_KEYS + SIZE_KEYS))
+    for stats in stats_list:
+        summary["runs"] += 1
+        for key in TIME_KEYS:
+            if stats.get(key) is not None:
+                summary[key] = (summary[key] or 0.0) + stats[key]
+        for key in SIZE_KEYS:
+            if stats.get(key) is not None:
+                summary[key] = max(summary[key] or 0, stats[key])
+        if stats.get("status") is not None:
+            summary["statuses"][stats["status"]] += 1
+    return summary
+
+
+# {instance: summary} over driver JobResults, instance_of(key) naming the
+# instance each job ran on
+def instance_stats(results, instance_of):
+    grouped = {}
+    for result in results:
+        stats = dict((result.result or {}).get("stats") or {}, validate_time=result.validate_time)
+        grouped.setdefault(instance_of(result.key), []).append(stats)
+    return {instance: summarise(stats_list) for (instance, stats_list) in grouped.items()}
+
+
+def _seconds(value):
+    return "-" if value is None else "%.3fs" % value
+
+
+# one line per instance for the harnesses' run-time printing
+def format_summary(instance, summary):
+    statuses = ", ".join("%s x%d" % item for item in sorted(summary["statuses"].items()))
+    return ("%s: %d runs, preprocess %s, build %s, solve %s, validate %s, largest model %s vars / %s cons / %s nz"
+            "%s" % (instance, summary["runs"], _seconds(summary["preprocess_time"]),
+                    _seconds(summary["build_time"]), _seconds(summary["solve_time"]),
+                    _seconds(summary["validate_time"]), summary["variables"], summary["constraints"],
+                    summary["nonzeros"], " [" + statuses + "]" if statuses else ""))
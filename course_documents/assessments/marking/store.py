@@ -0,0 +1,98 @@
+"""SQLite store of marking job outcomes, so a re-mark only runs what changed.
+
+An outcome is filed under the content hash of the submission file, the
+fingerprint of the instance graph, the run's parameters (k, timeout, limits),
+the solver version and a hash of the marking code (the marking package and the
+harness defining the check).  Editing a submission, changing an instance,
+upgrading the solver or fixing a checker gives new keys, so those jobs run
+again and everything else is read back.  Only settled outcomes are stored
+(marking.driver.is_settled): a crash, a timeout, a kill for memory, no result
+or a result not proven optimal may come from the machine's load rather than
+the submission.
+"""
+import pickle
+import sqlite3
+import time
+from collections import namedtuple
+
+from marking.fingerprint import code_hash, data_fingerprint, file_hash, graph_fingerprint
+
+StoreKey = namedtuple("StoreKey", ["submission", "instance", "params", "solver", "code"])
+
+_SCHEMA = """
+create table if not exists results (
+    submission text not null,
+    instance text not null,
+    params text not null,
+    solver text not null,
+    code text not null,
+    outcome text not null,
+    valid integer,
+    size integer,
+    wall_time real,
+    cpu_time real,
+    peak_rss integer,
+    validate_time real,
+    error text,
+    result blob,
+    recorded_at real not null,
+    primary key (submission, instance, params, solver, code)
+)
+"""
+
+_FIELDS = ("outcome", "valid", "size", "wall_time", "cpu_time", "peak_rss", "validate_time", "error")
+
+
+# params is a JSON-like dict, e.g. {"distance": 2, "timeout": 60}; code_paths
+# are files besides the marking package whose changes void the outcome, such as
+# the harness defining the check
+def store_key(submission_path, graph, params, solver, code_paths=()):
+    return StoreKey(file_hash(submission_path), graph_fingerprint(graph), data_fingerprint(params), solver,
+                    code_hash(code_paths))
+
+
+def ortools_version():
+    import ortools
+    return "ortools " + ortools.__version__
+
+
+class ResultStore:
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(_SCHEMA)
+        self.connection.commit()
+
+    # {field: value} with the unpickled result under "result", or None
+    def get(self, key):
+        row = self.connection.execute(
+            "select " + ", ".join(_FIELDS) + ", result from results"
+            " where submission = ? and instance = ? and params = ? and solver = ? and code = ?", tuple(key)).fetchone()
+        if row is None:
+            return None
+        found = dict(zip(_FIELDS, row))
+        found["valid"] = bool(found["valid"])
+        found["result"] = pickle.loads(row[-1]) if row[-1] is not None else None
+        return found
+
+    # job_result is a marking.driver JobResult
+    def put(self, key, job_result):
+        values = [getattr(job_result, field) for field in _FIELDS]
+        result = pickle.dumps(job_result.result) if job_result.result is not None else None
+        self.connection.execute(
+            "insert or replace into results (submission, instance, params, solver, code, " + ", ".join(_FIELDS)
+            + ", result, recorded_at) values (" + ", ".join("?" * (len(_FIELDS) + 7)) + ")",
+            tuple(key) + tuple(values) + (result, time.time()))
+        self.connection.commit()
+
+    def __len__(self):
+        return self.connection.execute("select count(*) from results").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,41 @@
+import random
+import networkx as nx
+import numpy as np
+from marking.batch import candidate_matrix, validate_burning_seqs, validate_dominating_sets
+from marking.burning import is_a_burning_seq
+from marking.domination import distance_dominates
+
+
+def test_dominating_sets_match_single_checks():
+    """A cohort of random sets gets the same verdicts as checking one at a time"""
+    rng = random.Random(11)
+    graph = nx.grid_2d_graph(6, 7)
+    graph.add_node("isolated")
+    nodes = list(graph)
+    cohort = [rng.sample(nodes, rng.randint(0, 12)) for _ in range(150)]
+    cohort.append(nodes)
+    for k in [0, 1, 2, 4]:
+        result = validate_dominating_sets(graph, cohort, k)
+        assert list(result.valid) == [distance_dominates(graph, s, k) for s in cohort]
+        assert list(result.sizes) == [len(set(s)) for s in cohort]
+
+
+def test_matrix_input():
+    path = nx.path_graph(5)
+    matrix = np.array([[0, 1, 0, 1, 0], [1, 0, 0, 0, 0]], dtype=bool)
+    assert (candidate_matrix(path, [[1, 3], [0, 99]]) == matrix).all()
+    result = validate_dominating_sets(path, matrix, 1)
+    assert list(result.valid) == [True, False]
+    assert list(result.sizes) == [2, 1]
+
+
+def test_burning_seqs_match_single_checks():
+    """Sequences of different lengths are each judged after their own last turn"""
+    rng = random.Random(5)
+    graph = nx.ladder_graph(9)
+    nodes = list(graph)
+    cohort = [rng.sample(nodes, rng.randint(1, 6)) for _ in range(120)]
+    cohort.append([0, None, 17])
+    result = validate_burning_seqs(graph, cohort)
+    assert list(result.valid) == [is_a_burning_seq(graph, seq) for seq in cohort]
+    assert list(result.sizes) == [len(seq) for seq in cohort]
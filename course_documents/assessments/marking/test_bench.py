@@ -0,0 +1,34 @@
+import math
+from marking.bench import FAMILIES, compare, family_instances, fastest_backends, geometric_sizes, scaling_exponents
+
+
+def row(n, seconds, valid=True, outcome="ok"):
+    return {"task": "assign-2", "solver": "reference", "family": "path", "k": 1, "n": n,
+            "seconds": seconds, "valid": valid, "outcome": outcome}
+
+
+def test_families_have_about_the_asked_size():
+    assert geometric_sizes(16, 256) == [16, 32, 64, 128, 256]
+    for family, graph in family_instances(list(FAMILIES), [64]):
+        assert 32 <= graph.number_of_nodes() <= 66, family
+
+
+def test_scaling_exponent_of_a_power_law():
+    rows = [row(n, 0.001 * n ** 2) for n in [16, 32, 64, 128]]
+    [fit] = scaling_exponents(rows)
+    assert math.isclose(fit["exponent"], 2.0) and fit["points"] == 4
+
+
+def test_compare_flags_slowdowns_and_lost_solutions():
+    baseline = [row(16, 1.0), row(32, 1.0), row(64, 1.0), row(128, 0.01)]
+    results = [row(16, 1.2), row(32, 2.0), row(64, None, False, "timeout"), row(128, 0.04)]
+    regressions = compare(results, baseline)
+    assert [r["n"] for r in regressions] == [32, 64]
+
+
+def test_fastest_backend_solves_most_then_quickest():
+    rows = [dict(row(16, seconds, valid), task="backends", solver=solver, family=family)
+            for (family, solver, seconds, valid) in [("grid", "SCIP", 2.0, True), ("grid", "CP-SAT", 0.5, True),
+                                                     ("grid", "CBC", None, False), ("path", "SCIP", 0.3, True),
+                                                     ("path", "CP-SAT", 0.1, False), ("path", "CBC", 0.4, True)]]
+    assert fastest_backends(rows + [row(16, 0.01)]) == {"grid": "CP-SAT", "path": "SCIP"}
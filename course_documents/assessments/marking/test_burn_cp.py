@@ -0,0 +1,63 @@
+import networkx as nx
+from marking.burn_cp import TimeExpandedBurning, ball_cover_rows, burn_ball_cover, burn_time_expanded
+from marking.burning import is_a_burning_seq
+from marking.csr import as_csr
+from marking.domination import DominationOracle
+
+
+def test_probes_share_one_model():
+    """Probing horizons in any order on one model finds a burning sequence exactly from the burning number up"""
+    path = nx.path_graph(10)    # burning number 4
+    engine = TimeExpandedBurning(path, 5, workers=1)
+    for B, feasible in [(5, True), (3, False), (4, True), (2, False), (1, False)]:
+        seq = engine.probe(B)
+        assert (seq is not None) == feasible, B
+        if feasible:
+            assert len(seq) == B and is_a_burning_seq(path, seq)
+    assert len(engine.minimise()) == 4
+
+
+def test_search_and_minimise_agree():
+    """Binary search and one minimisation solve reach the same proven optimum"""
+    for graph in (nx.ladder_graph(8), nx.grid_2d_graph(4, 4), nx.balanced_tree(2, 3)):
+        searched = burn_time_expanded(graph, 4, workers=1)
+        minimised = burn_time_expanded(graph, 4, workers=1, minimise=True)
+        assert len(searched["burn_seq"]) == len(minimised["burn_seq"])
+        for result in (searched, minimised):
+            assert result["stats"]["status"] == "OPTIMAL"
+            assert is_a_burning_seq(graph, result["burn_seq"])
+
+
+def test_ball_cover_rows_match_distances():
+    """A vertex's row holds exactly the (source, round) pairs whose ball reaches it"""
+    graph = as_csr(nx.grid_2d_graph(3, 4))
+    distance = dict(nx.all_pairs_shortest_path_length(nx.grid_2d_graph(3, 4)))
+    labels = graph.labels
+    for B in (1, 2, 3):
+        rows = ball_cover_rows(DominationOracle(graph), B)
+        for u, row in enumerate(rows):
+            expected = {(v, i) for v in range(graph.n) for i in range(1, B + 1)
+                        if distance[labels[u]][labels[v]] <= B - i}
+            assert sorted(row) == sorted(expected)
+
+
+def test_ball_cover_agrees_with_time_expanded():
+    """Both formulations, on either backend, prove the same burning number"""
+    for graph in (nx.ladder_graph(8), nx.grid_2d_graph(4, 4), nx.path_graph(10)):
+        expected = len(burn_time_expanded(graph, 5, workers=1)["burn_seq"])
+        for backend in ("CP-SAT", "SCIP"):
+            result = burn_ball_cover(graph, 5, workers=1, backend=backend)
+            assert result["stats"]["status"] == "OPTIMAL"
+            assert len(result["burn_seq"]) == expected
+            assert is_a_burning_seq(graph, result["burn_seq"])
+
+
+def test_driver_workers_search_on_one_thread(monkeypatch):
+    """Inside a marking.driver worker CP-SAT defaults to one search thread"""
+    from marking.driver import SOLVER_WORKERS_ENV
+
+    monkeypatch.setenv(SOLVER_WORKERS_ENV, "1")
+    assert TimeExpandedBurning(nx.path_graph(4), 3).workers == 1
+    monkeypatch.delenv(SOLVER_WORKERS_ENV)
+    assert TimeExpandedBurning(nx.path_graph(4), 3).workers == 8
+    assert TimeExpandedBurning(nx.path_graph(4), 3, workers=2).workers == 2
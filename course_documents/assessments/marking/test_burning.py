@@ -0,0 +1,49 @@
+import random
+import networkx as nx
+from marking.burning import is_a_burning_seq, simulate_burning
+from marking.csr import CSRGraph
+
+
+# the marker's original whole-graph spread, kept here as the reference
+def reference_is_a_burning_seq(graph, burning_seq):
+    burning = set()
+    for vertex in list(burning_seq) + [None]:
+        burning |= {v for v in graph for w in graph.neighbors(v) if w in burning}
+        if vertex is not None:
+            burning.add(vertex)
+    return all(v in burning for v in graph)
+
+
+def test_path_trace():
+    """Each turn spreads first and then lights the chosen vertex"""
+    path = nx.path_graph(5)
+    trace = simulate_burning(path, [2, 0])
+    assert trace.rounds == [[2], [1, 3, 0], [4]]
+    assert trace.burned_at == 3
+    assert is_a_burning_seq(path, [2, 0])
+    assert not is_a_burning_seq(path, [0])
+
+
+def test_duplicates_and_nones_light_nothing():
+    path = nx.path_graph(4)
+    trace = simulate_burning(path, [0, 0, None])
+    assert trace.rounds == [[0], [1], [2], [3]]
+    assert trace.burned_at == 4
+
+
+def test_empty_graph_is_burned():
+    assert simulate_burning(nx.Graph(), []).burned_at == 0
+
+
+def test_matches_reference_on_random_sequences():
+    """Agrees with the whole-graph spread on grids, ladders and random graphs"""
+    rng = random.Random(7)
+    graphs = [nx.grid_2d_graph(5, 5), nx.ladder_graph(10), nx.gnp_random_graph(30, 0.08, seed=3)]
+    for graph in graphs:
+        csr = CSRGraph.from_networkx(graph)
+        nodes = list(graph)
+        for _ in range(40):
+            seq = rng.sample(nodes, rng.randint(1, 6))
+            expected = reference_is_a_burning_seq(graph, seq)
+            assert is_a_burning_seq(graph, seq) == expected
+            assert is_a_burning_seq(csr, seq) == expected
@@ -0,0 +1,45 @@
+import networkx as nx
+from marking.components import centre_within, component_indices, components
+from marking.dom_ilp import solve_dominating_set
+from marking.domination import distance_dominates
+
+
+def test_components_keep_labels():
+    """Each component is its own graph with the original labels and edges"""
+    graph = nx.Graph([("a", "b"), ("b", "c"), ("x", "y")])
+    graph.add_node("z")
+    parts = components(graph)
+    assert [sorted(part.labels) for part in parts] == [["a", "b", "c"], ["x", "y"], ["z"]]
+    assert sorted(parts[0]["b"]) == ["a", "c"]
+    assert [len(part) for part in component_indices(nx.path_graph(4))] == [4]
+
+
+def test_centre_within_radius():
+    """The double sweep finds a centre exactly when k reaches the radius of a tree"""
+    for tree in (nx.path_graph(9), nx.balanced_tree(2, 4), nx.star_graph(6)):
+        radius = nx.radius(tree)
+        centre = centre_within(tree, radius)
+        assert centre is not None and distance_dominates(tree, [list(tree)[centre]], radius)
+        assert centre_within(tree, radius - 1) is None
+
+
+def test_forest_solves_per_component():
+    """A forest of small trees plus a hard component solves optimally, in a pool or not"""
+    forest = nx.disjoint_union_all([nx.path_graph(3), nx.star_graph(4), nx.path_graph(12), nx.cycle_graph(9)])
+    for workers in (1, 2):
+        result = solve_dominating_set(forest, 1, workers=workers)
+        assert distance_dominates(forest, result["dom_set"], 1)
+        assert len(result["dom_set"]) == 1 + 1 + 4 + 3
+        assert result["stats"]["components"] == {"components": 4, "closed_form": 2, "solved": 2, "from_previous": 0}
+        assert result["stats"]["objective"] == 9 and result["stats"]["status"] == "OPTIMAL"
+
+
+def test_driver_workers_solve_without_a_pool(monkeypatch):
+    """Inside a marking.driver worker the components are solved in process"""
+    import multiprocessing
+    from marking.driver import SOLVER_WORKERS_ENV
+
+    forest = nx.disjoint_union_all([nx.path_graph(12), nx.cycle_graph(9)])
+    monkeypatch.setenv(SOLVER_WORKERS_ENV, "1")
+    monkeypatch.setattr(multiprocessing, "get_context", lambda method: 1 / 0)
+    assert len(solve_dominating_set(forest, 1)["dom_set"]) == 4 + 3
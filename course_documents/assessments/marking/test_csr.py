@@ -0,0 +1,54 @@
+import pickle
+import networkx as nx
+import pytest
+from marking.csr import CSRGraph, bfs_layers
+from marking.domination import check_distance_domination
+from marking.dzn import parse_dzn
+
+
+def test_from_dzn_matches_networkx():
+    """Edge arrays and a networkx graph of the same instance give the same adjacency"""
+    values = parse_dzn("n = 6; m = 6; from = [1,1,2,3,3,4]; to = [2,4,3,4,5,5];")
+    graph = CSRGraph.from_dzn(values)
+    assert graph.n == 6 and graph.number_of_edges() == 6
+    assert graph.offsets.itemsize == 4 and graph.neighbours.itemsize == 4
+    reference = nx.Graph(zip(values["from"], values["to"]))
+    reference.add_node(6)
+    for v in reference:
+        assert sorted(graph[v]) == sorted(reference[v])
+    assert graph[6] == []
+
+
+def test_from_networkx_relabels():
+    """Arbitrary node names are kept as labels over 0..n-1 indices"""
+    grid = nx.grid_2d_graph(3, 3)
+    graph = CSRGraph.from_networkx(grid)
+    assert list(graph) == list(grid.nodes())
+    assert graph.number_of_edges() == grid.number_of_edges()
+    centre = graph.index((1, 1))
+    assert graph.degree(centre) == 4
+    assert graph.index((5, 5)) is None and (5, 5) not in graph
+    layers = list(bfs_layers(graph, [centre]))
+    assert [len(layer) for layer in layers] == [1, 4, 4]
+
+
+def test_immutable_and_picklable():
+    """Graphs cannot be changed in place but survive a trip to a worker process"""
+    graph = CSRGraph.from_edges(3, [0, 1], [1, 2])
+    with pytest.raises(AttributeError):
+        graph.m = 5
+    copy = pickle.loads(pickle.dumps(graph))
+    assert copy.neighbours == graph.neighbours and copy.labels == graph.labels
+
+
+def test_bad_endpoint():
+    with pytest.raises(ValueError):
+        CSRGraph.from_edges(3, [1, 2], [2, 4], base=1)
+
+
+def test_checkers_accept_either_graph():
+    """The domination checker gives the same answer on both representations"""
+    ladder = nx.ladder_graph(8)
+    for k in range(4):
+        assert check_distance_domination(ladder, [0, 15], k) == \
+            check_distance_domination(CSRGraph.from_networkx(ladder), [0, 15], k)
@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+import time
+from marking import client
+from marking.client import run_in_daemon
+
+ASSESSMENTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSIGN_0 = os.path.join(ASSESSMENTS, "assignments", "assign-0")
+
+
+def marker_output(env):
+    return subprocess.run([sys.executable, "dom-set-marking.py", "sample-input-file-0.dzn", "output.txt"],
+                          cwd=ASSIGN_0, env=env, capture_output=True, text=True)
+
+
+def start_daemon(path):
+    daemon = subprocess.Popen([sys.executable, "-m", "marking.daemon", "--socket", path], cwd=ASSESSMENTS)
+    for _ in range(100):
+        if os.path.exists(path):
+            break
+        time.sleep(0.05)
+    return daemon
+
+
+def test_daemon_gives_the_same_output(tmp_path, monkeypatch):
+    monkeypatch.chdir(ASSIGN_0)
+    path = str(tmp_path / "private" / "marking.sock")
+    daemon = start_daemon(path)
+    try:
+        assert os.stat(os.path.dirname(path)).st_mode & 0o777 == 0o700
+        code, stdout, _ = run_in_daemon(os.path.join(ASSIGN_0, "dom-set-marking.py"),
+                                        ["dom-set-marking.py", "sample-input-file-0.dzn", "output.txt"], path)
+        assert (code, stdout) == (0, "true,2\n")
+        code, _, stderr = run_in_daemon(os.path.join(ASSIGN_0, "dom-set-marking.py"),
+                                        ["dom-set-marking.py", "missing.dzn", "output.txt"], path)
+        assert code == 1 and "FileNotFoundError" in stderr
+
+        env = dict(os.environ, MARKING_SOCKET=path)
+        through_daemon = marker_output(dict(env, MARKING_DAEMON="1"))
+        direct = marker_output(env)
+        assert through_daemon.stdout == direct.stdout == "true,2\n"
+    finally:
+        daemon.terminate()
+        daemon.wait()
+    assert not os.path.exists(path)
+    assert run_in_daemon(os.path.join(ASSIGN_0, "dom-set-marking.py"), [], path) is None
+
+
+def test_refuses_shared_directory_and_stale_code(tmp_path, monkeypatch):
+    """No forwarding through a socket others could have bound, nor to a daemon on older code"""
+    shared = tmp_path / "shared"
+    shared.mkdir(mode=0o777)
+    shared.chmod(0o777)
+    assert not client.in_private_dir(str(shared / "marking.sock"))
+    assert run_in_daemon(os.path.join(ASSIGN_0, "dom-set-marking.py"), [], str(shared / "marking.sock")) is None
+
+    path = str(tmp_path / "private" / "marking.sock")
+    daemon = start_daemon(path)
+    try:
+        monkeypatch.setattr(client, "code_version", lambda: [("changed.py", 0, 0)])
+        assert run_in_daemon(os.path.join(ASSIGN_0, "dom-set-marking.py"),
+                             ["dom-set-marking.py", "sample-input-file-0.dzn", "output.txt"], path) is None
+    finally:
+        daemon.terminate()
+        daemon.wait()
@@ -0,0 +1,41 @@
+import networkx as nx
+import pytest
+from marking.dom_backends import BACKENDS, backend_for
+from marking.dom_greedy import greedy_cover
+from marking.dom_ilp import coverage_rows, solve_dominating_set
+from marking.domination import distance_dominates
+from marking.stats import new_stats
+
+
+def test_backends_agree():
+    """Every backend finds the same optimum and fills in the same stats"""
+    graph = nx.grid_2d_graph(6, 6)
+    results = {name: solve_dominating_set(graph, 2, timeout=20000, backend=name)
+               for name in list(BACKENDS) + ["CP-SAT/2"]}
+    for name, result in results.items():
+        assert distance_dominates(graph, result["dom_set"], 2), name
+        assert len(result["dom_set"]) == len(results["SCIP"]["dom_set"]), name
+        assert result["stats"]["backend"] == name
+        assert result["stats"]["status"] == "OPTIMAL" and result["stats"]["objective"] == len(result["dom_set"])
+        assert result["stats"].keys() == results["SCIP"]["stats"].keys()
+        assert result["stats"]["solve_time"] is not None and result["stats"]["build_time"] is not None
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        backend_for("GUROBI")
+    with pytest.raises(ValueError):
+        solve_dominating_set(nx.path_graph(3), 1, backend="SCIP/4")
+
+
+def test_hint_and_bound_leave_the_model_alone():
+    """A warm start reports the same model as a cold one, and CP-SAT still honours the bound"""
+    rows = coverage_rows(nx.grid_2d_graph(5, 5), 1)
+    hint = greedy_cover(range(25), rows)
+    for name in ("SCIP", "CP-SAT"):
+        cold, warm = new_stats(), new_stats()
+        backend_for(name)(range(25), rows, 20000, cold)
+        backend_for(name)(range(25), rows, 20000, warm, hint=hint, bound=len(hint))
+        assert cold["constraints"] == warm["constraints"] == len(rows), name
+        assert cold["nonzeros"] == warm["nonzeros"] and cold["objective"] == warm["objective"], name
+    assert backend_for("CP-SAT")(range(25), rows, 20000, new_stats(), bound=cold["objective"] - 1) is None
@@ -0,0 +1,29 @@
+import networkx as nx
+from marking.csr import as_csr
+from marking.dom_greedy import greedy_cover
+from marking.dom_ilp import coverage_rows, solve_dominating_set
+from marking.domination import distance_dominates
+
+
+def test_greedy_covers_every_row():
+    """The greedy set is a valid cover, without redundant vertices, and optimal on easy cases"""
+    for graph in [nx.gnp_random_graph(40, 0.08, seed=seed) for seed in range(5)] + [nx.grid_2d_graph(7, 7)]:
+        csr = as_csr(graph)
+        for k in (1, 2):
+            rows = coverage_rows(graph, k)
+            chosen = greedy_cover(range(csr.n), rows)
+            assert distance_dominates(graph, [csr.labels[i] for i in chosen], k)
+            for i in chosen:
+                assert not distance_dominates(graph, [csr.labels[j] for j in chosen if j != i], k)
+    assert greedy_cover(range(6), coverage_rows(nx.star_graph(5), 1)) == [0]
+
+
+def test_falls_back_to_greedy_when_out_of_time():
+    """With no time left the greedy cover comes back, flagged as not optimal"""
+    grid = nx.grid_2d_graph(60, 60)
+    result = solve_dominating_set(grid, 2, timeout=1)
+    assert result["stats"]["status"] == "GREEDY" and not result["optimal"]
+    assert distance_dominates(grid, result["dom_set"], 2)
+    assert len(result["dom_set"]) == result["stats"]["greedy_size"] == result["stats"]["objective"]
+    result = solve_dominating_set(nx.grid_2d_graph(5, 5), 2)
+    assert result["optimal"] and result["stats"]["greedy_size"] >= len(result["dom_set"])
@@ -0,0 +1,52 @@
+import networkx as nx
+from marking.csr import as_csr
+from marking.dom_ilp import coverage_rows, solve_dominating_set
+from marking.domination import distance_dominates, oracle_for
+
+
+def test_rows_are_the_distinct_truncated_balls():
+    """Each row is a vertex's k-ball, and equal balls give one row"""
+    grid = nx.grid_2d_graph(5, 4)
+    csr = as_csr(grid)
+    for k in range(0, 5):
+        balls = {tuple(sorted(csr.index(v) for v in nx.single_source_shortest_path_length(grid, u, cutoff=k)))
+                 for u in grid}
+        rows = coverage_rows(grid, k)
+        assert sorted(tuple(row) for row in rows) == sorted(balls)
+    assert len(coverage_rows(nx.complete_graph(8), 1)) == 1
+    assert len(coverage_rows(nx.star_graph(5), 2)) == 1
+
+
+def test_rows_come_from_the_shared_oracle():
+    """Solving a connected graph fills the balls of the oracle its validator gets"""
+    ladder = nx.ladder_graph(10)
+    oracle = oracle_for(ladder)
+    result = solve_dominating_set(ladder, 2, reduce=False)
+    assert oracle.stored > 0 and oracle.dominates(result["dom_set"], 2)
+    assert coverage_rows(ladder, 2, oracle) == coverage_rows(ladder, 2)
+
+
+def test_solves_to_the_known_optimum():
+    """Optimal sizes on paths and disconnected graphs, with the stats filled in"""
+    for n, k, size in [(7, 1, 3), (10, 2, 2), (6, 5, 1)]:
+        result = solve_dominating_set(nx.path_graph(n), k)
+        assert distance_dominates(nx.path_graph(n), result["dom_set"], k)
+        assert len(result["dom_set"]) == size
+        assert result["stats"]["status"] == "OPTIMAL"
+    graph = nx.Graph([("a", "b"), ("c", "d")])
+    graph.add_node("e")
+    result = solve_dominating_set(graph, 3)
+    assert len(result["dom_set"]) == 3 and distance_dominates(graph, result["dom_set"], 3)
+
+
+def test_multi_k_matches_separate_solves():
+    """Solving a list of distances at once gives the same optima, settling components once covered by one vertex"""
+    from marking.dom_ilp import solve_dominating_sets
+    graph = nx.disjoint_union(nx.grid_2d_graph(6, 6), nx.path_graph(15))
+    results = solve_dominating_sets(graph, [8, 1, 3, 20])
+    assert list(results) == [1, 3, 8, 20]
+    for k, result in results.items():
+        assert distance_dominates(graph, result["dom_set"], k)
+        assert len(result["dom_set"]) == len(solve_dominating_set(graph, k)["dom_set"])
+        assert result["optimal"]
+    assert results[20]["stats"]["components"]["from_previous"] == 2
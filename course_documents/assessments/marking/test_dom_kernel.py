@@ -0,0 +1,48 @@
+import networkx as nx
+from marking.dom_ilp import coverage_rows, solve_dominating_set
+from marking.dom_kernel import kernelize, leaf_supports
+from marking.domination import distance_dominates
+
+
+def test_leaf_rule():
+    """Leaf neighbours are forced, and one end of a lone edge"""
+    graph = nx.Graph([(0, 1), (1, 2), (2, 3), (4, 5)])
+    graph.add_node(6)
+    assert leaf_supports(graph) == {1, 2, 4}
+
+
+def test_kernel_keeps_the_optimum():
+    """Reduced and unreduced models agree on the optimum size, and the mapped back set dominates"""
+    graphs = [nx.gnp_random_graph(18, 0.15, seed=seed) for seed in range(6)]
+    graphs += [nx.balanced_tree(3, 3), nx.ladder_graph(7), nx.relabel_nodes(nx.path_graph(9), str)]
+    for graph in graphs:
+        for k in (1, 2, 3):
+            reduced = solve_dominating_set(graph, k)
+            full = solve_dominating_set(graph, k, reduce=False)
+            assert len(reduced["dom_set"]) == len(full["dom_set"])
+            assert distance_dominates(graph, reduced["dom_set"], k)
+            assert reduced["stats"]["objective"] == len(reduced["dom_set"])
+
+
+def test_trees_reduce_completely():
+    """The reductions alone solve trees, and say what they removed"""
+    tree = nx.balanced_tree(2, 6)
+    kernel = kernelize(tree, 1, coverage_rows(tree, 1))
+    assert kernel.rows == [] and kernel.variables == []
+    assert kernel.reduction["rows_before"] == 127 and kernel.reduction["rows_after"] == 0
+    assert kernel.reduction["leaf_forced"] == 32
+    complete = nx.complete_graph(10)
+    kernel = kernelize(complete, 1, coverage_rows(complete, 1))
+    assert kernel.reduction["variables_dominated"] == 9 and len(kernel.forced) == 1
+    result = solve_dominating_set(tree, 1)
+    assert result["stats"]["reduction"]["rows_after"] == 0 and result["stats"]["variables"] == 0
+
+
+def test_merged_stats_keep_their_types():
+    """Model sizes are 0 when no model was built, and stopped stays a flag across components"""
+    for graph in (nx.complete_graph(6), nx.path_graph(5)):
+        stats = solve_dominating_set(graph, 1)["stats"]
+        assert (stats["variables"], stats["constraints"], stats["nonzeros"]) == (0, 0, 0)
+    forest = nx.disjoint_union_all([nx.cycle_graph(9), nx.cycle_graph(12)])
+    reduction = solve_dominating_set(forest, 1, workers=1)["stats"]["reduction"]
+    assert reduction["stopped"] is False and reduction["rows_before"] == 21
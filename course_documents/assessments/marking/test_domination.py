@@ -0,0 +1,64 @@
+import math
+import networkx as nx
+from marking.domination import DominationOracle, check_distance_domination, distance_dominates, is_dominating_set, oracle_for
+
+
+def test_path_distances():
+    """The middle of a path dominates it exactly at its radius"""
+    path = nx.path_graph(7)
+    assert distance_dominates(path, [3], 3)
+    assert not distance_dominates(path, [3], 2)
+    result = check_distance_domination(path, [3], 3)
+    assert result == (True, [], 3)
+
+
+def test_reports_undominated_and_max_distance():
+    """A failing set lists what it missed and how far off it was"""
+    path = nx.path_graph(6)
+    result = check_distance_domination(path, [0], 2)
+    assert not result.dominates
+    assert result.undominated == [3, 4, 5]
+    assert result.max_distance == 5
+    assert check_distance_domination(path, [0], 2, measure=False).max_distance is None
+
+
+def test_disconnected_and_bad_candidates():
+    """Unreachable vertices give an infinite distance; empty or foreign sets never dominate"""
+    graph = nx.Graph([(1, 2), (3, 4)])
+    result = check_distance_domination(graph, [1], 5)
+    assert result.undominated == [3, 4]
+    assert result.max_distance == math.inf
+    assert not is_dominating_set(graph, [])
+    assert not is_dominating_set(graph, [7, 8])
+    assert is_dominating_set(graph, [1, 4])
+
+
+def test_grid_matches_all_pairs():
+    """Agrees with brute force shortest paths on a grid"""
+    grid = nx.grid_2d_graph(5, 5)
+    dom_set = [(0, 0), (4, 4)]
+    lengths = dict(nx.all_pairs_shortest_path_length(grid))
+    for k in range(0, 6):
+        expected = all(min(lengths[v][s] for s in dom_set) <= k for v in grid)
+        assert distance_dominates(grid, dom_set, k) == expected
+
+
+def test_oracle_balls_for_any_k():
+    """Balls grow from what is stored and match networkx's truncated search"""
+    grid = nx.grid_2d_graph(6, 6)
+    oracle = DominationOracle(grid)
+    for k in [2, 0, 5, 1, 20, 3]:
+        for v in grid:
+            expected = nx.single_source_shortest_path_length(grid, v, cutoff=k)
+            assert sorted(oracle.ball(v, k)) == sorted(expected)
+
+
+def test_oracle_budget_and_domination():
+    """The ball store stays within budget and domination holds for every k past the radius"""
+    path = nx.path_graph(30)
+    oracle = DominationOracle(path, max_stored=40)
+    for v in path:
+        oracle.ball(v, 3)
+        assert oracle.stored <= 40
+    assert [oracle.dominates([10, 20], k) for k in [8, 9, 10]] == [False, False, True]
+    assert oracle_for(path) is oracle_for(path)
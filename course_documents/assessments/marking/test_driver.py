@@ -0,0 +1,99 @@
+import json
+import os
+import time
+from functools import partial
+from marking.driver import CRASH, NO_RESULT, OK, OOM, SOLVER_WORKERS_ENV, TIMEOUT, Job, call_submission, results_table, run_jobs
+
+
+def returns(value):
+    return value
+
+
+def sleeps(seconds):
+    time.sleep(seconds)
+    return {"dom_set": []}
+
+
+def fails():
+    raise RuntimeError("broken submission")
+
+
+def allocates(size):
+    return {"dom_set": bytearray(size)}
+
+
+def spins():
+    while True:
+        pass
+
+
+def forks_and_hangs(pid_path):
+    child = os.fork()
+    if child == 0:
+        while True:
+            time.sleep(1)
+    pid_path.write_text(str(child))
+    time.sleep(60)
+
+
+def solver_workers():
+    return {"dom_set": [os.environ.get(SOLVER_WORKERS_ENV)]}
+
+
+def size_check(result):
+    return (True, len(result["dom_set"]))
+
+
+def test_outcomes_and_order(tmp_path):
+    """Results come back in job order whatever order the workers finish in"""
+    jobs = [Job(("slow", 1), partial(sleeps, 10), size_check),
+            Job(("ok", 1), partial(returns, {"dom_set": [1, 2]}), size_check),
+            Job(("none", 1), partial(returns, None), size_check),
+            Job(("crash", 1), fails, size_check)]
+    results_path = tmp_path / "results.jsonl"
+    started = time.monotonic()
+    results = run_jobs(jobs, workers=4, timeout=1.0, results_path=results_path)
+    assert time.monotonic() - started < 5
+    assert [r.outcome for r in results] == [TIMEOUT, OK, NO_RESULT, CRASH]
+    assert "broken submission" in results[3].error
+    assert results_table(results) == {("slow", 1): (False, None), ("ok", 1): (True, 2),
+                                      ("none", 1): (False, None), ("crash", 1): (False, None)}
+    rows = [json.loads(line) for line in results_path.read_text().splitlines()]
+    assert sorted(row["outcome"] for row in rows) == sorted([TIMEOUT, OK, NO_RESULT, CRASH])
+
+
+def test_submissions_load_from_their_file(tmp_path):
+    submission = tmp_path / "submitted.py"
+    submission.write_text("def run_ilp(graph, distance=1, timeout=1000):\n    return {'dom_set': [graph, distance]}\n")
+    jobs = [Job(k, partial(call_submission, str(submission), "run_ilp", "g", distance=k), size_check) for k in [1, 2]]
+    assert [r.result for r in run_jobs(jobs, workers=2)] == [{"dom_set": ["g", 1]}, {"dom_set": ["g", 2]}]
+
+
+def test_resource_limits_and_usage():
+    """Limits end only the job that breaks them, and every job reports its usage"""
+    jobs = [Job("ok", partial(allocates, 50 << 20), size_check),
+            Job("oom", partial(allocates, 1 << 40), size_check),
+            Job("cpu", spins, size_check)]
+    results = run_jobs(jobs, workers=3, timeout=30.0, memory_limit=8 << 30, cpu_limit=1)
+    assert [r.outcome for r in results] == [OK, OOM, TIMEOUT]
+    assert results[0].size == 50 << 20 and results[0].peak_rss >= 50 << 20
+    assert results[2].cpu_time > 0.5 and results[2].wall_time < 10
+    assert all(r.peak_rss > 0 and r.cpu_time >= 0 for r in results)
+
+
+def test_timeout_kills_forked_children(tmp_path):
+    """A worker killed at its timeout takes the processes it forked with it"""
+    pid_path = tmp_path / "child.pid"
+    jobs = [Job("hangs", partial(forks_and_hangs, pid_path), size_check), Job("env", solver_workers, size_check)]
+    results = run_jobs(jobs, workers=2, timeout=1.0)
+    assert [r.outcome for r in results] == [TIMEOUT, OK]
+    assert results[1].result == {"dom_set": ["1"]}
+    child = int(pid_path.read_text())
+    for _ in range(50):
+        try:
+            os.kill(child, 0)
+        except ProcessLookupError:
+            break
+        time.sleep(0.1)
+    else:
+        raise AssertionError("forked child outlived its worker")
@@ -0,0 +1,33 @@
+from array import array
+from marking.dzn import parse_dzn, read_dzn, to_networkx
+
+
+def test_multi_line_arrays_and_comments():
+    """Arrays may wrap over lines and comments are skipped"""
+    values = parse_dzn("""n = 5; m = 6;  % sizes
+k = 2;
+from = [1,1,2,
+        3,3,4];
+to = array1d(1..6, [2,4,3,4,5,5]);
+empty = [];
+""")
+    assert values["n"] == 5 and values["m"] == 6 and values["k"] == 2
+    assert values["from"] == array("i", [1, 1, 2, 3, 3, 4])
+    assert values["to"] == array("i", [2, 4, 3, 4, 5, 5])
+    assert values["from"].itemsize == 4
+    assert len(values["empty"]) == 0
+
+
+def test_to_networkx_keeps_isolated_vertices():
+    """Vertex n is kept even if it has no edges"""
+    graph = to_networkx(parse_dzn("n = 4; m = 1; from = [1]; to = [2];"))
+    assert sorted(graph.nodes()) == [1, 2, 3, 4]
+    assert list(graph.edges()) == [(1, 2)]
+
+
+def test_reads_sample_instance(tmp_path):
+    """Reading a file gives the same values as parsing its text"""
+    text = "n = 5;\nm = 6;\nfrom = [1,1,2,3,3,4];\nto = [2,4,3,4,5,5];"
+    path = tmp_path / "sample.dzn"
+    path.write_text(text)
+    assert read_dzn(path) == parse_dzn(text)
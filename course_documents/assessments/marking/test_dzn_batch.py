@@ -0,0 +1,32 @@
+import io
+from marking.dzn_batch import mark_directory, write_rows
+
+PATH_5 = "n = 5;\nm = 4;\nk = 1;\nfrom = [1, 2, 3, 4];\nto = [2, 3, 4, 5];\n"
+STAR_4 = "n = 4;\nm = 3;\nfrom = [1, 1, 1];\nto = [2, 3, 4];\n"
+
+
+def test_every_pair_gets_a_row(tmp_path):
+    instances = tmp_path / "instances"
+    instances.mkdir()
+    (instances / "path.dzn").write_text(PATH_5)
+    (instances / "star.dzn").write_text(STAR_4)
+    submissions = tmp_path / "submissions"
+    outputs = [("alice", "decision = [0, 1, 0, 1, 0];\n----------\n", "decision = [1, 0, 0, 0];\n----------\n"),
+               ("bob", "decision = [1, 0, 0, 0, 1];\n----------\n", None)]
+    for name, path_output, star_output in outputs:
+        (submissions / name).mkdir(parents=True)
+        (submissions / name / "path.txt").write_text(path_output)
+        if star_output is not None:
+            (submissions / name / "star.out").write_text(star_output)
+
+    rows = mark_directory(str(instances), str(submissions), workers=2)
+    table = {(row["submission"], row["instance"]): (row["valid"], row["size"]) for row in rows}
+    assert table == {("alice", "path"): ("true", 2), ("bob", "path"): ("false", 2),
+                     ("alice", "star"): ("true", 1), ("bob", "star"): ("false", None)}
+    assert [row["error"] for row in rows if row["submission"] == "bob"] == [None, "no output file"]
+
+    rows = mark_directory(str(instances), str(submissions), distance=2)
+    assert [row["valid"] for row in rows if row["instance"] == "path"] == ["true", "true"]
+    out = io.StringIO()
+    write_rows(rows, out)
+    assert out.getvalue().splitlines()[0] == "submission,instance,distance,valid,size,output,error"
@@ -0,0 +1,31 @@
+import random
+from marking.intervals import invalid_intervals, missed_meetings, overlaps, repeated_values, unwanted_meetings
+
+
+# the marker's original pairwise test, on 0-based guests
+def check_overlap(i, j, start, end):
+    return start[i] <= start[j] < end[i] or start[j] <= start[i] < end[j]
+
+
+def test_overlaps_match_pairwise_check():
+    rng = random.Random(3)
+    start = [rng.randint(0, 30) for _ in range(60)]
+    end = [s + rng.randint(-2, 8) for s in start]
+    first = [rng.randint(1, 60) for _ in range(500)]
+    second = [rng.randint(1, 60) for _ in range(500)]
+    expected = [check_overlap(i - 1, j - 1, start, end) for i, j in zip(first, second)]
+    assert overlaps(start, end, first, second).tolist() == expected
+    pairs = list(zip(first, second))
+    assert missed_meetings(start, end, first, second) == [p for p, met in zip(pairs, expected) if not met]
+    assert unwanted_meetings(start, end, first, second) == [p for p, met in zip(pairs, expected) if met]
+
+
+def test_reports_every_offender():
+    assert invalid_intervals([1, 5, 3, 2], [2, 5, 1, 4]).tolist() == [2, 3]
+    assert repeated_values([4, 1, 4, 2, 1, 4]).tolist() == [1, 4]
+    assert repeated_values([]).tolist() == []
+
+
+def test_guests_without_times_meet_nobody():
+    assert missed_meetings([1], [3], [1], [2]) == [(1, 2)]
+    assert unwanted_meetings([1], [3], [1], [2]) == []
@@ -0,0 +1,68 @@
+import asyncio
+from collections import namedtuple
+from minizinc import Status
+from marking import mzn_async
+from marking.mzn_async import MznRun, solve_all
+
+Result = namedtuple("Result", ["status", "solution"])
+
+
+# stands in for minizinc.Instance: solutions yields the given results, then
+# hangs for hang seconds if asked
+def fake_instance(results, hang=None):
+    class FakeInstance:
+        def __init__(self, solver, model):
+            self.data = {}
+
+        def __setitem__(self, name, value):
+            self.data[name] = value
+
+        async def solutions(self, time_limit, intermediate_solutions):
+            for result in results:
+                yield result
+            if hang is not None:
+                await asyncio.sleep(hang)
+
+    return FakeInstance
+
+
+def no_minizinc(monkeypatch, instance):
+    monkeypatch.setattr(mzn_async, "solver_for", lambda solver: solver)
+    monkeypatch.setattr(mzn_async, "model_for", lambda path: path)
+    monkeypatch.setattr(mzn_async, "Instance", instance)
+
+
+def test_keeps_the_best_intermediate_solution(monkeypatch):
+    no_minizinc(monkeypatch, fake_instance([Result(Status.SATISFIED, {"burn": [3, 1, 2]}),
+                                            Result(Status.SATISFIED, {"burn": [2, 1]}),
+                                            Result(Status.OPTIMAL_SOLUTION, None)]))
+    [outcome] = solve_all([MznRun("run", "model.mzn", {"n": 3})], time_limit=5.0)
+    assert outcome.result.solution == {"burn": [2, 1]}
+    assert outcome.status == "OPTIMAL_SOLUTION" and not outcome.cut_off and outcome.error is None
+
+
+def test_cancelled_at_the_deadline(monkeypatch):
+    """A run that outlives its time limit and the grace period is cut off, keeping its best solution"""
+    no_minizinc(monkeypatch, fake_instance([Result(Status.SATISFIED, {"burn": [3, 1, 2]})], hang=60))
+    monkeypatch.setattr(mzn_async, "GRACE", 0.1)
+    [outcome] = solve_all([MznRun("run", "model.mzn", {})], time_limit=0.2)
+    assert outcome.cut_off and outcome.error is None
+    assert outcome.result.solution == {"burn": [3, 1, 2]} and outcome.wall_time < 5
+
+
+def test_errors_are_reported(monkeypatch, tmp_path):
+    """A failing run reports its error, and is neither a solution nor a cut-off"""
+    async def failing(solver, fzn, ozn, time_limit):
+        yield {"type": "solution", "output": {"json": {"burn": [1]}}}
+        raise RuntimeError("model failed to compile")
+
+    no_minizinc(monkeypatch, fake_instance([]))
+    monkeypatch.setattr(mzn_async, "flat_files", lambda instance, flat_dir, key: ("model.fzn", "model.ozn"))
+    monkeypatch.setattr(mzn_async, "flat_key", lambda model, data, solver: "key")
+    monkeypatch.setattr(mzn_async, "_flat_solutions", failing)
+    [outcome] = solve_all([MznRun("run", "model.mzn", {})], time_limit=5.0, flat_dir=str(tmp_path))
+    assert "model failed to compile" in outcome.error and not outcome.cut_off
+
+    monkeypatch.setattr(mzn_async, "solver_for", lambda solver: 1 / 0)
+    [outcome] = solve_all([MznRun("run", "model.mzn", {})], time_limit=5.0)
+    assert "ZeroDivisionError" in outcome.error and outcome.result is None
@@ -0,0 +1,33 @@
+import networkx as nx
+from marking.fingerprint import data_fingerprint, graph_fingerprint
+from marking.mzn_cache import edge_list_data, flat_key, model_for
+
+
+def test_models_shared_by_content(tmp_path):
+    """Two copies of one model share a Model; an edited model gets its own"""
+    first = tmp_path / "a.mzn"
+    second = tmp_path / "b.mzn"
+    first.write_text("int: n;\n")
+    second.write_text("int: n;\n")
+    assert model_for(first) is model_for(second)
+    second.write_text("int: n;\nint: m;\n")
+    assert model_for(first) is not model_for(second)
+
+
+def test_edge_list_data_relabels_once():
+    graph = nx.Graph([("a", "b"), ("b", "c")])
+    data, nodes_list = edge_list_data(graph)
+    assert nodes_list == ["a", "b", "c"]
+    assert data == {"n": 3, "m": 2, "from": [2, 3], "to": [1, 2]}
+    assert edge_list_data(nx.Graph([("a", "b"), ("b", "c")]))[0] is data
+    assert graph_fingerprint(graph) != graph_fingerprint(nx.Graph([("b", "c"), ("a", "b")]))
+
+
+def test_flat_key_depends_on_every_part(tmp_path):
+    model = tmp_path / "model.mzn"
+    model.write_text("int: n;\n")
+    key = flat_key(model, {"n": 3}, "gecode")
+    assert key == flat_key(model, {"n": 3}, "gecode")
+    assert key != flat_key(model, {"n": 4}, "gecode")
+    assert key != flat_key(model, {"n": 3}, "chuffed")
+    assert data_fingerprint({"a": 1, "b": [2]}) == data_fingerprint({"b": [2], "a": 1})
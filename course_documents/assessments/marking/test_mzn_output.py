@@ -0,0 +1,132 @@
+import io
+import mmap
+import os
+import subprocess
+import sys
+from array import array
+from marking.mzn_output import OPTIMAL, SATISFIED, UNKNOWN, UNSATISFIABLE, last_solution, read_solutions
+
+ASSESSMENTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+INTERMEDIATE = """decision = [1, 1, 1, 0, 1];
+----------
+% a comment from the solver
+decision = [1, 0,
+  0, 0, 1];
+size = 2;
+----------
+==========
+"""
+
+
+def test_yields_every_solution_then_status():
+    stream = read_solutions(io.StringIO(INTERMEDIATE))
+    solutions = list(stream)
+    assert [list(s["decision"]) for s in solutions] == [[1, 1, 1, 0, 1], [1, 0, 0, 0, 1]]
+    assert solutions[1]["size"] == 2
+    assert stream.status == OPTIMAL and stream.count == 2
+
+
+def test_last_solution_from_file_and_mmap(tmp_path):
+    path = tmp_path / "output.txt"
+    path.write_text(INTERMEDIATE)
+    assert last_solution(path)["decision"] == array("i", [1, 0, 0, 0, 1])
+    with open(path, "rb") as output_file:
+        mapped = mmap.mmap(output_file.fileno(), 0, access=mmap.ACCESS_READ)
+        assert last_solution(mapped)["size"] == 2
+
+
+def test_status_without_solutions():
+    stream = read_solutions(io.BytesIO(b"=====UNSATISFIABLE=====\n"))
+    assert stream.is_unsatisfiable() and stream.status == UNSATISFIABLE
+    stream = read_solutions(io.StringIO("=====UNKNOWN=====\n"))
+    assert stream.last() is None and stream.status == UNKNOWN
+    assert not read_solutions(io.StringIO("x = 1;\n----------\n")).is_unsatisfiable()
+
+
+def test_cut_off_run_keeps_complete_solutions():
+    """A run killed mid-way is judged on its last complete solution"""
+    stream = read_solutions(io.StringIO("x = 1;\n----------\nx = [2,\n"))
+    assert stream.last() == {"x": 1}
+    assert stream.status == SATISFIED
+
+
+# exactly what dist-dominating-set-assign-1.mzn's output item prints
+TEMPLATE_OUTPUT = "decision = [1, 0, 0, 0, 0]\n----------\n==========\n"
+
+
+def test_assignment_without_semicolon():
+    """Output items need not end assignments with a semicolon, even before the dashes"""
+    assert last_solution(io.StringIO(TEMPLATE_OUTPUT))["decision"] == array("i", [1, 0, 0, 0, 0])
+    assert last_solution(io.StringIO("decision = [1, 0,\n 1]----------\n"))["decision"] == array("i", [1, 0, 1])
+    assert last_solution(io.StringIO("size = 2\nx = 3; y = 4;\n----------\n")) == {"size": 2, "x": 3, "y": 4}
+
+
+def test_hyphenated_names():
+    """Region names like the colouring spec's Cape-Breton are kept whole"""
+    solution = last_solution(io.StringIO("Cape-Breton = 2;\nAntigonish = 3;\n----------\n"))
+    assert solution == {"Cape-Breton": 2, "Antigonish": 3}
+
+
+def run_marker(directory, args, stdin=None):
+    return subprocess.run([sys.executable] + args, cwd=directory, input=stdin, capture_output=True, text=True)
+
+
+def test_assign_1_marker_reads_template_output(tmp_path):
+    output = tmp_path / "output.txt"
+    output.write_text(TEMPLATE_OUTPUT)
+    marked = run_marker(os.path.join(ASSESSMENTS, "assignments", "assign-1"),
+                        ["dist-dom-set-marking.py", "sample-input-file-1.dzn", str(output), "2"])
+    assert marked.stdout == "true,1\n", marked.stderr
+
+
+NS_COLOURING = """Shelburne = 1;
+Yarmouth = 2;
+Digby = 1;
+Queens = 2;
+Annapolis = 3;
+Lunenburg = 1;
+Kings = 2;
+Hants = 3;
+Halifax = 2;
+Colchester = 1;
+Cumberland = 2;
+Pictou = 2;
+Guysborough = 1;
+Antigonish = 3;
+Inverness = 2;
+Richmond = 3;
+Victoria = 1;
+Cape-Breton = 2;
+----------
+"""
+
+
+def test_colour_ns_marker_reads_spec_names():
+    for directory in ("code_used_for_marking", "marking_code_for_practice"):
+        marked = run_marker(os.path.join(ASSESSMENTS, "pre-2025-assessments", "assign_1", directory),
+                            ["mark_colour_ns.py", "verbose"], NS_COLOURING)
+        assert marked.stdout.endswith("Total marks for colouring NS: 6\n"), marked.stderr
+
+
+def test_trailing_block_without_dashes():
+    """A last solution with no dashes after it counts if it is whole, even with no dashes anywhere"""
+    stream = read_solutions(io.StringIO("decision = [1, 0, 0, 0, 1];"))
+    assert stream.last() == {"decision": array("i", [1, 0, 0, 0, 1])} and stream.status == SATISFIED
+    assert last_solution(io.StringIO("x = 1;\n----------\nx = 2;\ny = 3;\n")) == {"x": 2, "y": 3}
+    assert last_solution(io.StringIO("% just a comment\n")) is None
+
+
+def test_markers_without_a_solution(tmp_path):
+    """Output the markers find no solution in is marked false rather than crashing them"""
+    undecided = tmp_path / "undecided.txt"
+    undecided.write_text("=====UNKNOWN=====\n")
+    bare = tmp_path / "bare.txt"
+    bare.write_text("decision = [1, 0, 0, 0, 1];")
+    assign_0 = os.path.join(ASSESSMENTS, "assignments", "assign-0")
+    assign_1 = os.path.join(ASSESSMENTS, "assignments", "assign-1")
+    for output, expected in ((undecided, "false,0\n"), (bare, "true,2\n")):
+        marked = run_marker(assign_0, ["dom-set-marking.py", "sample-input-file-0.dzn", str(output)])
+        assert marked.stdout == expected, marked.stderr
+    marked = run_marker(assign_1, ["dist-dom-set-marking.py", "sample-input-file-1.dzn", str(undecided), "2"])
+    assert marked.stdout == "false,0\n", marked.stderr
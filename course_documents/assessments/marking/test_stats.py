@@ -0,0 +1,36 @@
+from marking.stats import cp_sat_size, mip_stats, new_stats, phase, summarise
+
+
+def test_phases_add_up():
+    stats = new_stats()
+    for _ in range(2):
+        with phase(stats, "solve_time"):
+            pass
+    assert stats["solve_time"] > 0 and stats["build_time"] is None
+
+
+def test_model_sizes():
+    from ortools.linear_solver import pywraplp
+    from ortools.sat.python import cp_model
+    solver = pywraplp.Solver.CreateSolver("SCIP")
+    x = [solver.IntVar(0, 1, "x%d" % i) for i in range(3)]
+    solver.Add(x[0] + x[1] >= 1)
+    solver.Add(x[1] + x[2] >= 1)
+    solver.Minimize(sum(x))
+    stats = mip_stats(new_stats(), solver, solver.Solve())
+    assert (stats["variables"], stats["constraints"], stats["nonzeros"]) == (3, 2, 4)
+    assert stats["status"] == "OPTIMAL" and stats["objective"] == stats["best_bound"] == 1
+
+    model = cp_model.CpModel()
+    a, b = model.NewBoolVar("a"), model.NewBoolVar("b")
+    model.Add(a + b == 1)
+    model.AddBoolOr([a, b]).OnlyEnforceIf(a)
+    assert cp_sat_size(model) == (2, 2, 5)
+
+
+def test_summary_sums_times_and_keeps_largest_model():
+    runs = [dict(new_stats(), solve_time=1.0, variables=10, status="OPTIMAL"),
+            dict(new_stats(), solve_time=2.0, variables=30, status="FEASIBLE"), {}]
+    summary = summarise(runs)
+    assert summary["runs"] == 3 and summary["solve_time"] == 3.0 and summary["variables"] == 30
+    assert summary["build_time"] is None and summary["statuses"] == {"OPTIMAL": 1, "FEASIBLE": 1}
@@ -0,0 +1,81 @@
+import time
+import networkx as nx
+from functools import partial
+from marking.driver import CRASH, NO_RESULT, OK, TIMEOUT, Job, run_jobs
+from marking.store import ResultStore, store_key
+
+
+def counted(path, value):
+    with open(path, "a") as calls:
+        calls.write("x")
+    return {"dom_set": [value]}
+
+
+def crashes():
+    raise RuntimeError("flaky")
+
+
+def hangs():
+    time.sleep(60)
+
+
+def size_check(result):
+    return (True, len(result["dom_set"]))
+
+
+def test_stored_jobs_are_not_rerun(tmp_path):
+    submission = tmp_path / "submitted.py"
+    submission.write_text("def run_ilp(graph): pass\n")
+    calls = tmp_path / "calls"
+    graph = nx.grid_2d_graph(3, 3)
+    keys = [store_key(submission, graph, {"distance": k}, "v1") for k in [1, 2]]
+    jobs = [Job(("grid", k), partial(counted, calls, (0, k)), size_check, key) for k, key in zip([1, 2], keys)]
+    jobs.append(Job("crash", crashes, size_check, store_key(submission, graph, {}, "v1")))
+    with ResultStore(str(tmp_path / "results.sqlite")) as store:
+        first = run_jobs(jobs, workers=2, store=store)
+        assert len(store) == 2 and calls.read_text() == "xx"
+        second = run_jobs(jobs, workers=2, store=store)
+        assert calls.read_text() == "xx"
+        assert [r.outcome for r in second] == [OK, OK, CRASH]
+        assert second[1].result == first[1].result == {"dom_set": [(0, 2)]}
+        assert second[0].wall_time == first[0].wall_time
+
+        submission.write_text("def run_ilp(graph): return None\n")
+        changed = Job(("grid", 1), partial(counted, calls, (0, 1)), size_check,
+                      store_key(submission, graph, {"distance": 1}, "v1"))
+        run_jobs([changed], store=store)
+        assert calls.read_text() == "xxx"
+
+
+def returns(value):
+    return value
+
+
+def test_load_dependent_outcomes_are_not_stored(tmp_path):
+    """Timeouts, no result and unproven incumbents run again next time; proven optima are kept"""
+    submission = tmp_path / "submitted.py"
+    submission.write_text("def run_ilp(graph): pass\n")
+    graph = nx.path_graph(3)
+    results = [None, {"dom_set": [1], "stats": {"status": "FEASIBLE"}}, {"dom_set": [1], "stats": {"status": "GREEDY"}},
+               {"dom_set": [1], "stats": {"status": "OPTIMAL"}}]
+    jobs = [Job("slow", hangs, size_check, store_key(submission, graph, {"job": "slow"}, "v1"))]
+    jobs += [Job(i, partial(returns, result), size_check, store_key(submission, graph, {"job": i}, "v1"))
+             for i, result in enumerate(results)]
+    with ResultStore(str(tmp_path / "results.sqlite")) as store:
+        outcomes = [r.outcome for r in run_jobs(jobs, workers=2, timeout=0.5, store=store)]
+        assert outcomes == [TIMEOUT, NO_RESULT, OK, OK, OK]
+        assert len(store) == 1 and store.get(jobs[-1].store_key) is not None
+
+
+def test_key_follows_the_checker(tmp_path):
+    """Editing the harness that defines the check gives a new key"""
+    submission = tmp_path / "submitted.py"
+    submission.write_text("def run_ilp(graph): pass\n")
+    harness = tmp_path / "harness.py"
+    harness.write_text("def check(result): return (True, 1)\n")
+    graph = nx.path_graph(3)
+    before = store_key(submission, graph, {}, "v1", [harness])
+    assert store_key(submission, graph, {}, "v1", [harness]) == before
+    harness.write_text("def check(result): return (False, 1)\n")
+    after = store_key(submission, graph, {}, "v1", [harness])
+    assert after.code != before.code and after[:4] == before[:4]
@@ -1,5 +1,10 @@
+import os
 import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from marking.csr import CSRGraph
+from marking.mzn_output import last_solution
+
 def everyone_has_colour(sol_d, edge_list):
     for guy in edge_list:
       if guy not in sol_d:
@@ -24,14 +29,10 @@ def max_num_colours(sol_d):
 
 
 
+# only the last solution printed is marked
 def read_out():
-   read_sol = {}
-   input_stream = sys.stdin
-   for line in input_stream:
-      if not line.startswith("-") and not line.startswith("="):
-        split = line.strip().split()
-        read_sol[split[0]] = int(split[2].split(";")[0])
-   return read_sol
+   solution = last_solution(sys.stdin)
+   return dict(solution) if solution is not None else {}
 
 def mark_mzn_output(verbose = False):
    edge_list = {}
@@ -53,6 +54,7 @@ def mark_mzn_output(verbose = False):
    edge_list['Richmond'] = ['Guysborough', 'Inverness', 'Cape-Breton']
    edge_list['Victoria'] = ['Inverness', 'Cape-Breton']
    edge_list['Cape-Breton'] = ['Victoria', 'Richmond']
+   edge_list = CSRGraph.from_adjacency(edge_list)
    
    student_sol = read_out()
    fix_CB = {}
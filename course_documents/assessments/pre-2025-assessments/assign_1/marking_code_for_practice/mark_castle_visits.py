@@ -1,10 +1,13 @@
+import os
 import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from marking.dzn import read_dzn
+from marking.intervals import invalid_intervals, missed_meetings, repeated_values, unwanted_meetings
+from marking.mzn_output import last_solution
+
 def intervals_valid(start, end):
-  for i in range(len(start)):
-    if start[i] >= end[i]:
-      return False
-  return True
+  return len(invalid_intervals(start, end)) == 0
 
 def max_time_respected(dict_in, end, max_time = 30):
   return max(end) <= max_time
@@ -13,75 +16,33 @@ def everyone_has_time(dict_in, start, end):
    return len(start) == len(end) and len(start) == dict_in['n']
   
 def all_arrivals_different(start):
-  return len(list(set(start))) == len(start)
+  return len(repeated_values(start)) == 0
     
 def all_departures_different(end):
-  return len(list(set(end))) == len(end)
+  return len(repeated_values(end)) == 0
 
-def check_overlap(i, j, start, end):
-  # case iji   
-  if start[i] <= start[j] and start[j] < end[i]:
-    return True
-#  case jij
-  if start[j] <= start[i] and start[i] < end[j]:
-    return True
-  return False
-  
+# every pair that should meet is checked, and each one that doesn't is reported
 def meet_that_should(dict_in, start, end):
-  for ind in range(len(dict_in['from'])):
-    i = dict_in['from'][ind] -1
-    j = dict_in['to'][ind] -1
-    if not check_overlap(i, j, start, end):
-      print(str(i+1) + " and " + str(j+1) + "don't meet")
-      return False
-  return True
+  missed = missed_meetings(start, end, dict_in['from'], dict_in['to'])
+  for (i, j) in missed:
+    print(str(i) + " and " + str(j) + "don't meet")
+  return not missed
 
 def dont_meet_shouldnt(dict_in, start, end):
-  for ind in range(len(dict_in['no_from'])):
-    i = dict_in['no_from'][ind] -1
-    j = dict_in['no_to'][ind] -1
-    if check_overlap(i, j, start, end):
-      return False
-  return True
-
-def read_input_file(filename):
-  dict_input = {}
-  integer_vals = ['n', 'm', 'no_m']
-  list_vals = ['from', 'to', 'no_from', 'no_to']
-  for line in open(filename, 'r'):
-    first_token = line.strip().split()[0]
-    if first_token in integer_vals:
-      dict_input[first_token] = read_int_mzn(line)
-    elif first_token in list_vals:
-      dict_input[first_token] = read_int_list_mzn(line)
-  return dict_input
-
-def read_int_mzn(s):
-  split = s.strip().split()
-  return int(split[2].replace(";", ""))
-
-def read_int_list_mzn(s):
-  split = s.strip().split("[")[1].split("]")
-  split = split[0].split(",")
-  return list(map(int, split))
+  return not unwanted_meetings(start, end, dict_in['no_from'], dict_in['no_to'])
 
+# only the last solution printed is marked
 def read_student_sol():
-   start_time = []
-   end_time = []
-   input_stream = sys.stdin
-   for line in input_stream:
-      if line.startswith("start_time"):
-         start_time = read_int_list_mzn(line)
-      elif line.startswith('end_time'):
-        end_time = read_int_list_mzn(line)
-        
-   return start_time,end_time
+   solution = last_solution(sys.stdin)
+   if solution is None:
+      return [], []
+   return list(solution.get('start_time', [])), list(solution.get('end_time', []))
   
 
 
 def do_testing(verbose = False):
   start,end = read_student_sol()
-  dict_in = read_input_file(sys.argv[1])
+  dict_in = read_dzn(sys.argv[1])
   solution_max_time = int(sys.argv[2])
   
   print(start)
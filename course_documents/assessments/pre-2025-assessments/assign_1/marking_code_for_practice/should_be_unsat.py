@@ -1,11 +1,11 @@
+import os
 import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from marking.mzn_output import read_solutions
+
 def find_unsat():
-    input_stream = sys.stdin
-    for line in input_stream:
-        if 'UNSAT' in line:
-            return True
-    return False
+    return read_solutions(sys.stdin).is_unsatisfiable()
 
 
 points_for_unsat = 3